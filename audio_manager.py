@@ -1,29 +1,110 @@
-import pygame
-import pyttsx3
+import os
 import threading
-
-try:
-    import winsound
-    SOUND_AVAILABLE = True
-except ImportError:
-    SOUND_AVAILABLE = False
+import time
+import numpy as np
 from tkinter import filedialog, messagebox
 
+# Bound by load_audio_modules on the audio thread, so the window paints before SDL and the TTS engine load
+pygame = None
+sound_synth = None
+SoundCache = None
+TTSWorker = None
+
+TICK_CHANNELS = 4
+# Playback-rate variants for ticks; faster wheels click higher
+TICK_PITCH_STEPS = (0.85, 0.95, 1.0, 1.1, 1.25)
+MAX_TICK_VELOCITY = 45.0
+TTS_CACHE_DIR = os.path.join("profiles", ".tts")
+ANNOUNCE_PREFIX = "The winner is"
+ANNOUNCE_JOIN = "plus"
+
+def load_audio_modules():
+    global pygame, sound_synth, SoundCache, TTSWorker
+    import pygame
+    import sound_synth
+    from sound_cache import SoundCache
+    from tts_worker import TTSWorker
+
 class AudioManager:
     def __init__(self):
-        pygame.mixer.init()
-        try:
-            self.tts_engine = pyttsx3.init()
-        except:
-            self.tts_engine = None
         self.custom_spin_sound = None
         self.custom_win_sound = None
         self.bg_music = None
         self.enabled = True
         self.tts_enabled = True
+        self.next_tick_channel = 0
+        self.tick_counters = {"requested": 0, "played": 0, "coalesced": 0, "dropped": 0}
+        # Multiplies the pitch of the built-in tick and fanfare
+        self.synth_pitch = 1.0
+        # Until the mixer is up, plays are skipped and profile work is parked here
+        self.ready = False
+        self.lock = threading.Lock()
+        self.pending_preload = None
+        self.pending_names = None
+        self.pending_music = None
+
+    def start(self):
+        threading.Thread(target=self.init_audio, daemon=True).start()
+
+    def init_audio(self):
+        started = time.perf_counter()
+        try:
+            load_audio_modules()
+            self.init_mixer()
+        except Exception as e:
+            print("Audio unavailable:", e)
+            return
+        with self.lock:
+            self.ready = True
+            paths, self.pending_preload = self.pending_preload, None
+            names, self.pending_names = self.pending_names, None
+            volume, self.pending_music = self.pending_music, None
+        if paths: self.sounds.preload(paths)
+        if names is not None: self.prerender_announcements(names)
+        if volume is not None: self.play_bg_music(volume)
+        print(f"Audio ready after {(time.perf_counter() - started) * 1000:.0f} ms in the background")
+
+    def init_mixer(self):
+        pygame.mixer.init()
+        # Ticks get their own channels so they never cut off a win sound, and vice versa
+        pygame.mixer.set_num_channels(max(16, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(TICK_CHANNELS + 1)
+        self.tick_channels = [pygame.mixer.Channel(i) for i in range(TICK_CHANNELS)]
+        # Announcements share one channel, so a new winner cuts off the previous one instead of talking over it
+        self.announce_channel = pygame.mixer.Channel(TICK_CHANNELS)
+        self.sounds = SoundCache()
+        self.tts = TTSWorker(TTS_CACHE_DIR)
+        self.warm_synth()
+
+    def warm_synth(self):
+        # Built-in sounds for when no custom file is set, synthesized once so a play is just a mixer call
+        for rate in TICK_PITCH_STEPS:
+            sound_synth.synth_sound("tick", self.synth_pitch * rate)
+        sound_synth.synth_sound("fanfare", self.synth_pitch)
+
+    def set_synth_pitch(self, pitch):
+        self.synth_pitch = pitch
+        if self.ready: self.warm_synth()
+
+    def preload(self, paths):
+        # Decodes everything a profile can play up front, off the UI thread
+        paths = [p for p in dict.fromkeys([self.custom_spin_sound, self.custom_win_sound] + list(paths)) if p]
+        with self.lock:
+            if not self.ready:
+                self.pending_preload = paths
+                return
+        threading.Thread(target=self.sounds.preload, args=(paths,), daemon=True).start()
+
+    def play_cached(self, path):
+        if not self.ready: return False
+        sound = self.sounds.get(path)
+        if sound is None: return False
+        sound.play()
+        return True
 
     def toggle_sound(self):
         self.enabled = not self.enabled
+        if not self.ready: return self.enabled
         if not self.enabled:
             pygame.mixer.music.pause()
         elif self.bg_music and pygame.mixer.music.get_pos() != -1:
@@ -44,6 +125,10 @@ class AudioManager:
                 
     def play_bg_music(self, volume=0.3):
         if not self.enabled or not self.bg_music: return
+        with self.lock:
+            if not self.ready:
+                self.pending_music = volume
+                return
         try:
             pygame.mixer.music.load(self.bg_music)
             pygame.mixer.music.set_volume(volume)
@@ -52,66 +137,130 @@ class AudioManager:
             pass
 
     def set_bg_volume(self, volume):
-        if self.bg_music and self.enabled:
+        if self.ready and self.bg_music and self.enabled:
             pygame.mixer.music.set_volume(volume)
 
-    def announce_winner(self, text):
-        if not self.tts_enabled or not self.tts_engine: return
-        def speak():
-            try:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-            except:
-                pass
-        threading.Thread(target=speak, daemon=True).start()
+    def prerender_announcements(self, names):
+        with self.lock:
+            if not self.ready:
+                self.pending_names = list(names)
+                return
+        phrases = [ANNOUNCE_PREFIX, ANNOUNCE_JOIN] + [n for n in names if n]
+        self.tts.prerender(phrases)
+        self.preload([self.tts.wav_path(p) for p in phrases if self.tts.is_rendered(p)])
+
+    def announce_winner(self, names):
+        if not self.tts_enabled or not self.ready: return
+        parts = [ANNOUNCE_PREFIX]
+        for i, name in enumerate(names):
+            if i: parts.append(ANNOUNCE_JOIN)
+            parts.append(name)
+        sound = self.join_announcement(parts)
+        if sound is not None:
+            self.announce_channel.play(sound)
+            return
+        # Names added since the profile loaded are spoken live once, then rendered for next time
+        self.tts.say(" ".join(parts) + "!")
+        self.tts.prerender(parts)
+
+    def join_announcement(self, parts):
+        # Pre-rendered phrases are decoded to the mixer format, so joining them is one array concatenate
+        sounds = []
+        for part in parts:
+            if not self.tts.is_rendered(part): return None
+            sound = self.sounds.get(self.tts.wav_path(part))
+            if sound is None: return None
+            sounds.append(sound)
+        try:
+            return pygame.sndarray.make_sound(np.ascontiguousarray(np.concatenate([pygame.sndarray.array(s) for s in sounds])))
+        except Exception as e:
+            print("Could not join announcement:", e)
+            return None
 
     def load_spin_sound(self):
         path = filedialog.askopenfilename(filetypes=[("Audio Files", "*.wav *.mp3 *.ogg")])
         if path:
             self.custom_spin_sound = path
+            self.preload([])
             messagebox.showinfo("Sound Loaded", "Custom spin sound loaded successfully!")
 
     def load_win_sound(self):
         path = filedialog.askopenfilename(filetypes=[("Audio Files", "*.wav *.mp3 *.ogg")])
         if path:
             self.custom_win_sound = path
+            self.preload([])
             messagebox.showinfo("Sound Loaded", "Custom win sound loaded successfully!")
 
     def play_custom_option_sound(self, path):
         if not self.enabled or not path: return False
-        try:
-            pygame.mixer.Sound(path).play()
-            return True
-        except:
-            return False
+        return self.play_cached(path)
 
     def play_soundboard(self, key, soundboard_dict):
         if not self.enabled: return False
         path = soundboard_dict.get(str(key))
         if not path: return False
-        try:
-            pygame.mixer.Sound(path).play()
-            return True
-        except:
-            return False
+        return self.play_cached(path)
 
     def play_spin_sound(self):
-        if not self.enabled: return
-        if self.custom_spin_sound:
-            try: pygame.mixer.Sound(self.custom_spin_sound).play()
-            except: pass
-        elif SOUND_AVAILABLE:
-            try: winsound.Beep(800, 50)
-            except: pass
+        self.play_ticks(1, MAX_TICK_VELOCITY / 2)
+
+    def play_ticks(self, count, velocity):
+        # Called once per frame from the UI thread; every peg crossed in that frame is heard as one click
+        c = self.tick_counters
+        c["requested"] += count
+        c["coalesced"] += count - 1
+        if not self.enabled or not self.ready:
+            c["dropped"] += 1
+            return
+        speed = min(1.0, max(0.0, velocity / MAX_TICK_VELOCITY))
+        sound = self.tick_sound(self.custom_spin_sound, speed)
+        channel = self.free_tick_channel()
+        if sound is None or channel is None:
+            c["dropped"] += 1
+            return
+        channel.set_volume(0.35 + 0.65 * speed)
+        channel.play(sound)
+        c["played"] += 1
+
+    def free_tick_channel(self):
+        n = len(self.tick_channels)
+        for i in range(n):
+            channel = self.tick_channels[(self.next_tick_channel + i) % n]
+            if not channel.get_busy():
+                self.next_tick_channel = (self.next_tick_channel + i + 1) % n
+                return channel
+        return None
+
+    def tick_sound(self, path, speed):
+        step = min(len(TICK_PITCH_STEPS) - 1, int(speed * len(TICK_PITCH_STEPS)))
+        if not path:
+            return sound_synth.synth_sound("tick", self.synth_pitch * TICK_PITCH_STEPS[step])
+        base = self.sounds.get(path)
+        if base is None or TICK_PITCH_STEPS[step] == 1.0: return base
+        # Pitched copies live in the sound cache too, so they count against the same byte budget
+        key = (path, step)
+        sound = self.sounds.cached(key)
+        if sound is None:
+            sound = self.sounds.put(key, self.resample(base, TICK_PITCH_STEPS[step]))
+        return sound
+
+    def resample(self, sound, rate):
+        # Playing the same samples faster raises the pitch; nearest-sample is plenty for a click
+        try:
+            samples = pygame.sndarray.array(sound)
+            idx = np.round(np.linspace(0, len(samples) - 1, max(1, int(len(samples) / rate)))).astype(np.int64)
+            return pygame.sndarray.make_sound(np.ascontiguousarray(samples[idx]))
+        except Exception as e:
+            print("Could not pitch tick sound:", e)
+            return sound
+
+    def take_tick_counters(self):
+        # Counts since the last call, for a metrics view or bench script
+        counters = self.tick_counters
+        self.tick_counters = {"requested": 0, "played": 0, "coalesced": 0, "dropped": 0}
+        return counters
 
     def play_win_sound(self):
-        if not self.enabled: return
-        if self.custom_win_sound:
-            try: pygame.mixer.Sound(self.custom_win_sound).play()
-            except: pass
-        elif SOUND_AVAILABLE:
-            try:
-                winsound.Beep(1000, 200)
-                winsound.Beep(1200, 200)
-                winsound.Beep(1500, 400)
-            except: pass
+        if not self.enabled or not self.ready: return
+        if self.custom_win_sound and self.play_cached(self.custom_win_sound): return
+        sound_synth.synth_sound("fanfare", self.synth_pitch).play()
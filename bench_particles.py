@@ -0,0 +1,69 @@
+import argparse
+import time
+import tkinter as tk
+import numpy as np
+from constants import THEMES
+from particles import ParticleSystem
+from wheel_renderer import WheelRenderer
+from slice_table import SliceTableCache
+
+WIDTH, HEIGHT = 1280, 720
+COUNTS = [1000, 10000, 50000]
+
+def make_system(count, seed):
+    system = ParticleSystem(rng=np.random.default_rng(seed))
+    colors = THEMES["Default"]
+    per_style = count // 3
+    system.spawn("Confetti", colors, WIDTH, HEIGHT, count - 2 * per_style)
+    system.spawn("Fireworks", colors, WIDTH, HEIGHT, per_style)
+    # Money is capped per burst, so add it in bursts like repeated wins would
+    while system.count < count:
+        system.spawn("Falling Money", colors, WIDTH, HEIGHT, min(40, count - system.count))
+    # Spread everything over the visible area so both paths draw the same work
+    system.y[:system.count] = system.rng.uniform(0, HEIGHT, system.count)
+    return system
+
+def time_frames(draw, frames):
+    draw()
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) / frames * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare canvas-item and raster particle rendering.")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--counts", type=int, nargs="*", default=COUNTS)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.withdraw()
+    canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT)
+    canvas.pack()
+    root.update()
+    renderer = WheelRenderer(canvas, SliceTableCache())
+
+    print(f"{'particles':>10} {'items ms/frame':>16} {'raster ms/frame':>16} {'speedup':>8}")
+    for count in args.counts:
+        renderer.particles = make_system(count, args.seed)
+
+        def draw_items():
+            canvas.delete("particles")
+            renderer.draw_particle_items()
+            canvas.update_idletasks()
+
+        def draw_raster():
+            renderer.raster().draw(canvas, renderer.particles, WIDTH, HEIGHT)
+            canvas.update_idletasks()
+
+        items_ms = time_frames(draw_items, args.frames)
+        canvas.delete("particles")
+        raster_ms = time_frames(draw_raster, args.frames)
+        renderer.raster().detach(canvas)
+        print(f"{count:>10} {items_ms:>16.2f} {raster_ms:>16.2f} {items_ms / raster_ms:>7.1f}x")
+
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
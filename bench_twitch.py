@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import multiprocessing
+import queue
+import time
+import numpy as np
+from twitch_client import TwitchClient, parse_line
+from twitch_standin import TwitchStandin, ChatLoad
+from spin_queue import SpinQueue
+
+RATES = [100, 1000, 10000]
+CHANNEL = "bench"
+POLL_MS = 100 # Same as main.TWITCH_POLL_MS
+SPIN_SECONDS = 8.0
+
+def serve_load(results, rate, seconds, spin_ratio, seed):
+    # Runs in its own process so generating the load does not share a GIL with the client being measured
+    async def run():
+        server = await TwitchStandin(port=0).start()
+        results.put(("port", server.port))
+        channel = "#" + CHANNEL
+        while not any(channel in c.channels for c in server.clients):
+            await asyncio.sleep(0.01)
+        load = ChatLoad(server, CHANNEL, rate, spin_ratio, seed=seed)
+        await load.run(seconds)
+        results.put(("sent", load.sent, load.spins))
+        # Let the client hang up first, so the bench does not measure a reconnect
+        deadline = time.monotonic() + 5.0
+        while server.clients and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        await server.close()
+    asyncio.run(run())
+
+def bench_parse(count, seed):
+    server = TwitchStandin()
+    load = ChatLoad(server, CHANNEL, 0, spin_ratio=0.05, seed=seed)
+    lines = []
+    for _ in range(count):
+        user, text = load.message()
+        lines.append(server.chat_lines("#" + CHANNEL, user, text)[0])
+
+    start = time.perf_counter()
+    for raw in lines:
+        parse_line(raw.decode("utf-8").rstrip("\r\n"))
+    parse_rate = count / (time.perf_counter() - start)
+
+    # handle() is what the client really runs per line: it only fully parses lines that may be commands
+    client = TwitchClient(CHANNEL, "oauth:bench")
+    start = time.perf_counter()
+    for raw in lines:
+        client.handle(raw)
+    handle_rate = count / (time.perf_counter() - start)
+    return parse_rate, handle_rate
+
+def bench_rate(rate, seconds, spin_ratio, seed):
+    results = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=serve_load, args=(results, rate, seconds, spin_ratio, seed), daemon=True)
+    proc.start()
+    _, port = results.get(timeout=10)
+
+    client = TwitchClient(CHANNEL, "oauth:bench", host="127.0.0.1", port=port)
+    client.start()
+    # The UI side as main.py runs it: drain on a timer, feed !spin into the spin queue, one spin at a time
+    busy_until = [0.0]
+    def start_spin(request):
+        busy_until[0] = time.monotonic() + SPIN_SECONDS
+        return True
+    spins = SpinQueue(start_spin, lambda: time.monotonic() < busy_until[0])
+
+    latencies, depths = [], []
+    polls = 0
+    sent = None
+    settle = None
+    start = time.perf_counter()
+    while settle is None or time.perf_counter() < settle:
+        time.sleep(POLL_MS / 1000)
+        polls += 1
+        depths.append(client.events.qsize())
+        now_ms = time.time() * 1000
+        for msg in client.drain():
+            latencies.append(now_ms - int(msg.tags.get("tmi-sent-ts", now_ms)))
+            spins.submit(msg.nick, msg.text)
+        spins.on_spin_finished()
+        if sent is None:
+            try:
+                sent = results.get_nowait()
+                settle = time.perf_counter() + 1.0
+            except queue.Empty:
+                pass
+    elapsed = time.perf_counter() - start
+    client.stop()
+    proc.join(timeout=5)
+
+    lat = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "sent": sent[1], "spins": sent[2], "lines": client.lines, "commands": client.commands, "dropped": client.dropped,
+        "p50": np.percentile(lat, 50), "p95": np.percentile(lat, 95), "max": lat.max(),
+        "depth_max": max(depths), "depth_mean": sum(depths) / len(depths),
+        "ui_calls_per_s": polls / elapsed, "spin_queue": spins.metrics()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Twitch chat path against the local stand-in server.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--spin-ratio", type=float, default=0.01)
+    parser.add_argument("--parse-lines", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--rates", type=int, nargs="*", default=RATES)
+    args = parser.parse_args()
+
+    parse_rate, handle_rate = bench_parse(args.parse_lines, args.seed)
+    print(f"parse_line: {parse_rate:,.0f} lines/s    handle (with command pre-filter): {handle_rate:,.0f} lines/s")
+    print()
+    print(f"{'msg/s':>7} {'sent':>8} {'received':>9} {'cmds':>6} {'dropped':>8} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} "
+          f"{'queue max':>9} {'queue avg':>9} {'UI calls/s':>10} {'spins run':>9} {'spins peak q':>12}")
+    for rate in args.rates:
+        r = bench_rate(rate, args.seconds, args.spin_ratio, args.seed)
+        q = r["spin_queue"]
+        print(f"{rate:>7} {r['sent']:>8} {r['lines']:>9} {r['commands']:>6} {r['dropped']:>8} {r['p50']:>7.1f} {r['p95']:>7.1f} {r['max']:>7.1f} "
+              f"{r['depth_max']:>9} {r['depth_mean']:>9.1f} {r['ui_calls_per_s']:>10.1f} {q['started']:>9} {q['peak_depth']:>12}")
+
+if __name__ == "__main__":
+    main()
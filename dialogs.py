@@ -1,6 +1,9 @@
 import customtkinter as ctk
 import tkinter as tk
+import datetime
 from tkinter import messagebox, filedialog
+from virtual_list import VirtualList
+from history_export import ExportJob
 
 class OptionDialog:
     @staticmethod
@@ -86,10 +89,15 @@ class ListboxDialog:
         dialog.geometry("300x400")
         dialog.attributes("-topmost", True)
         
-        listbox = tk.Listbox(dialog, font=("Arial", 12), bg="#2d3436", fg="#ffffff", selectbackground="#0984e3")
+        def make_row(parent):
+            return tk.Label(parent, font=("Arial", 12), bg="#2d3436", fg="#ffffff", anchor="w", padx=6)
+            
+        def fill_row(row, opt, index, selected):
+            row.configure(text=f"{opt.get('name', '')} (W: {opt.get('weight', 1)})", bg="#0984e3" if selected else "#2d3436")
+            
+        listbox = VirtualList(dialog, 26, make_row, fill_row, fg_color="#2d3436")
         listbox.pack(fill="both", expand=True, padx=10, pady=10)
-        for opt in options: 
-            listbox.insert("end", f"{opt.get('name', '')} (W: {opt.get('weight', 1)})")
+        listbox.set_items(options)
             
         def handle_action():
             sel = listbox.curselection()
@@ -107,24 +115,31 @@ class ListboxDialog:
 
 class HistoryDialog:
     @staticmethod
-    def show(parent, history, save_callback, export_callback):
+    def show(parent, history, clear_callback, export_callback):
         dialog = ctk.CTkToplevel(parent)
         dialog.title("Spin History")
-        dialog.geometry("400x500")
+        dialog.geometry("400x540")
         dialog.attributes("-topmost", True)
         
-        frame = ctk.CTkScrollableFrame(dialog)
-        frame.pack(fill="both", expand=True, padx=10, pady=10)
+        count_label = ctk.CTkLabel(dialog, text="")
+        count_label.pack(pady=(10, 0))
         
-        def refresh_history():
-            for widget in frame.winfo_children():
-                widget.destroy()
-            if not history:
-                ctk.CTkLabel(frame, text="No history available.").pack(pady=20)
-            else:
-                for item in history:
-                    ctk.CTkLabel(frame, text=f"{item['time']}\n{item['result']}", font=ctk.CTkFont(weight="bold"), anchor="w", justify="left").pack(fill="x", pady=5)
+        row_font = ctk.CTkFont(weight="bold")
+        def make_row(parent):
+            return ctk.CTkLabel(parent, text="", font=row_font, anchor="w", justify="left")
+            
+        def fill_row(row, item, index, selected):
+            row.configure(text=f"{item['time']}\n{item['result']}")
+            
+        # Rows are fetched a viewport at a time straight from the log
+        rows = VirtualList(dialog, 52, make_row, fill_row)
+        rows.pack(fill="both", expand=True, padx=10, pady=10)
         
+        def refresh_history():
+            total = len(history)
+            count_label.configure(text=f"{total} spins" if total else "No history available.")
+            rows.set_source(total, history.page)
+            
         refresh_history()
         
         btn_frame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -132,9 +147,76 @@ class HistoryDialog:
         
         def clear_history():
             if messagebox.askyesno("Clear", "Clear spin history?", parent=dialog):
-                history.clear()
-                save_callback()
+                clear_callback()
                 refresh_history()
                 
         ctk.CTkButton(btn_frame, text="Export CSV", command=export_callback).pack(side="left", expand=True, padx=5)
         ctk.CTkButton(btn_frame, text="Clear History", fg_color="#d63031", hover_color="#ff7675", command=clear_history).pack(side="right", expand=True, padx=5)
+
+class ExportDialog:
+    @staticmethod
+    def show(parent, open_reader):
+        dialog = ctk.CTkToplevel(parent)
+        dialog.title("Export History")
+        dialog.geometry("360x330")
+        dialog.attributes("-topmost", True)
+        
+        ctk.CTkLabel(dialog, text="Format:").pack(pady=(10, 0))
+        fmt_var = ctk.StringVar(value="CSV")
+        ctk.CTkOptionMenu(dialog, variable=fmt_var, values=["CSV", "Columnar"]).pack(pady=5, padx=20, fill="x")
+        
+        ctk.CTkLabel(dialog, text="From (YYYY-MM-DD, optional):").pack(pady=(10, 0))
+        from_entry = ctk.CTkEntry(dialog)
+        from_entry.pack(pady=5, padx=20, fill="x")
+        ctk.CTkLabel(dialog, text="To (YYYY-MM-DD, inclusive, optional):").pack(pady=(10, 0))
+        to_entry = ctk.CTkEntry(dialog)
+        to_entry.pack(pady=5, padx=20, fill="x")
+        
+        progress = ctk.CTkProgressBar(dialog)
+        progress.set(0)
+        progress.pack(pady=10, padx=20, fill="x")
+        status = ctk.CTkLabel(dialog, text="")
+        status.pack()
+        job = [None]
+        
+        def parse_date(text, next_day=False):
+            text = text.strip()
+            if not text: return None
+            day = datetime.datetime.strptime(text, "%Y-%m-%d").date()
+            if next_day: day += datetime.timedelta(days=1)
+            return day.isoformat()
+            
+        def poll():
+            if not dialog.winfo_exists(): return
+            j = job[0]
+            progress.set(j.progress())
+            status.configure(text=f"{j.done_rows} rows")
+            if not j.finished:
+                dialog.after(100, poll)
+                return
+            button.configure(text="Export", command=start)
+            if j.error is not None:
+                messagebox.showerror("Error", f"Failed to export history: {j.error}", parent=dialog)
+            elif j.cancelled:
+                status.configure(text="Export cancelled.")
+            else:
+                status.configure(text=f"Exported {j.done_rows} rows.")
+                
+        def start():
+            try:
+                start_date = parse_date(from_entry.get())
+                end_date = parse_date(to_entry.get(), next_day=True)
+            except ValueError:
+                messagebox.showwarning("Error", "Dates must look like 2024-12-31.", parent=dialog)
+                return
+            fmt = fmt_var.get()
+            ext, types = (".csv", [("CSV files", "*.csv")]) if fmt == "CSV" else (".wofc", [("Columnar history", "*.wofc")])
+            path = filedialog.asksaveasfilename(defaultextension=ext, filetypes=types, initialfile="spin_history" + ext, parent=dialog)
+            if not path: return
+            # Runs on its own reader, so spinning and the rest of the UI carry on while it streams
+            job[0] = ExportJob(open_reader, path, fmt, start_date, end_date).start()
+            button.configure(text="Cancel", command=job[0].cancel)
+            poll()
+            
+        button = ctk.CTkButton(dialog, text="Export", command=start)
+        button.pack(pady=10)
@@ -0,0 +1,129 @@
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from slice_table import SliceTable
+from spin_physics import predict_spins
+
+# Headless on purpose: nothing here may import tkinter, so it runs on servers and in CI
+PROFILES_DIR = "profiles"
+CHUNK_SPINS = 100000
+
+def profile_path(profile):
+    if os.path.exists(profile): return profile
+    return os.path.join(PROFILES_DIR, profile if profile.endswith(".json") else profile + ".json")
+
+def load_profile_data(profile):
+    with open(profile_path(profile), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_wheels(profile):
+    data = load_profile_data(profile)
+    if "wheels" in data:
+        return data["wheels"]
+    # Same migration as ProfileManager.load_profile for old single-wheel profiles
+    opts = [{"name": o, "weight": 1} if isinstance(o, str) else o for o in data.get("options", [])]
+    return [{"name": "Wheel 1", "options": opts}]
+
+def simulate_chunk(wheel_options, spins, seed, power=None):
+    # Draws spins the way on_spin_release does: one charge per spin, a random kick per wheel
+    rng = np.random.default_rng(seed)
+    tables = [SliceTable(options) for options in wheel_options]
+    angles = rng.uniform(0, 360, (spins, len(tables)))
+    power_factor = rng.uniform(0, 1, (spins, 1)) if power is None else np.full((spins, 1), power)
+    velocities = 15.0 + power_factor * 25.0 + rng.uniform(0, 5, (spins, len(tables)))
+    _, winners = predict_spins(angles, velocities, tables)
+    return [np.bincount(winners[:, i], minlength=t.size) for i, t in enumerate(tables)]
+
+def run(wheel_options, spins, seed=None, power=None, workers=None, chunk=CHUNK_SPINS):
+    sizes = [chunk] * (spins // chunk) + ([spins % chunk] if spins % chunk else [])
+    # Independent child streams, so the result for a seed does not depend on the worker count
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    counts = [np.zeros(len(options), dtype=np.int64) for options in wheel_options]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(simulate_chunk, wheel_options, n, s, power) for n, s in zip(sizes, seeds)]
+        for future in futures:
+            for total, part in zip(counts, future.result()):
+                total += part
+    return counts
+
+def upper_gamma_q(a, x):
+    # Regularized upper incomplete gamma Q(a, x): series below a + 1, continued fraction above
+    if x <= 0: return 1.0
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        for _ in range(10000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15: break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        if abs(d) < tiny: d = tiny
+        c = b + an / c
+        if abs(c) < tiny: c = tiny
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15: break
+    return math.exp(log_prefix) * h
+
+def chi_square(observed, expected):
+    # Zero-weight slices can never win, so they carry no degrees of freedom
+    used = expected > 0
+    stat = float((((observed[used] - expected[used]) ** 2) / expected[used]).sum())
+    dof = int(used.sum()) - 1
+    if dof <= 0: return stat, dof, 1.0
+    return stat, dof, upper_gamma_q(dof / 2, stat / 2)
+
+def report(wheels, counts, spins):
+    for wheel, observed in zip(wheels, counts):
+        options = wheel["options"]
+        weights = np.array([opt.get("weight", 1) for opt in options], dtype=np.float64)
+        expected = spins * weights / weights.sum() if weights.sum() > 0 else np.zeros(len(options))
+        stat, dof, p = chi_square(observed.astype(np.float64), expected)
+
+        print(f"\n{wheel['name']}")
+        print(f"{'option':<24} {'weight':>8} {'expected %':>11} {'observed %':>11} {'diff %':>8} {'wins':>10}")
+        for opt, weight, e, o in zip(options, weights, expected, observed):
+            e_pct = e / spins * 100
+            o_pct = o / spins * 100
+            print(f"{opt['name'][:24]:<24} {weight:>8g} {e_pct:>11.3f} {o_pct:>11.3f} {o_pct - e_pct:>+8.3f} {o:>10}")
+        print(f"chi-square = {stat:.2f}, dof = {dof}, p = {p:.4f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo check that wheel slices pay out at their configured weights.")
+    parser.add_argument("profile", nargs="?", default="default", help="profile name in profiles/ or a path to a profile JSON")
+    parser.add_argument("--spins", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--power", type=float, default=None, help="fixed charge from 0 to 1 (default: uniform)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    wheels = load_wheels(args.profile)
+    wheel_options = [w["options"] for w in wheels]
+    if not wheel_options or any(not options for options in wheel_options):
+        parser.error("every wheel needs at least one option")
+
+    start = time.perf_counter()
+    counts = run(wheel_options, args.spins, args.seed, args.power, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{args.spins} spins in {elapsed:.2f}s ({args.spins / elapsed:,.0f} spins/s)")
+    report(wheels, counts, args.spins)
+
+if __name__ == "__main__":
+    main()
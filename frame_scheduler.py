@@ -0,0 +1,81 @@
+import time
+
+class FrameScheduler:
+    def __init__(self, root, on_frame, interval_ms=16):
+        self.root = root
+        self.on_frame = on_frame
+        self.interval_ms = interval_ms
+        self.animations = {}
+        self.dirty = set()
+        self.after_id = None
+        self.last_tick = 0.0
+        self.ticking = False
+
+    def start(self, name, tick):
+        # tick(dt, now) is called once per frame and returns False when the animation is done
+        self.animations[name] = tick
+        self.wake()
+
+    def stop(self, name):
+        self.animations.pop(name, None)
+
+    def is_running(self, name):
+        return name in self.animations
+
+    def request_redraw(self, part):
+        self.dirty.add(part)
+        self.wake()
+
+    def wake(self):
+        # Inside a tick the loop re-arms itself at the end, keeping its frame timing
+        if self.after_id is not None or self.ticking: return
+        if not self.animations:
+            # Nothing is moving, so a redraw request only needs one idle pass
+            self.after_id = self.root.after_idle(self.tick)
+            return
+        self.last_tick = time.perf_counter()
+        self.after_id = self.root.after(self.interval_ms, self.tick)
+
+    def tick(self):
+        self.after_id = None
+        now = time.perf_counter()
+        dt = now - self.last_tick if self.last_tick else 0.0
+        self.last_tick = now
+        self.ticking = True
+        try:
+            self.run_frame(dt, now)
+        finally:
+            self.ticking = False
+
+        if self.animations:
+            elapsed_ms = (time.perf_counter() - now) * 1000
+            self.after_id = self.root.after(max(1, int(self.interval_ms - elapsed_ms)), self.tick)
+        else:
+            self.last_tick = 0.0
+            # A redraw requested while the frame was drawn gets one more idle pass
+            if self.dirty:
+                self.after_id = self.root.after_idle(self.tick)
+
+    def run_frame(self, dt, now):
+        for name, tick in list(self.animations.items()):
+            if self.animations.get(name) is not tick: continue
+            try:
+                keep = tick(dt, now)
+            except Exception as e:
+                print(f"Animation '{name}' failed:", e)
+                keep = False
+            if not keep and self.animations.get(name) is tick:
+                del self.animations[name]
+
+        if self.dirty:
+            parts = self.dirty
+            self.dirty = set()
+            self.on_frame(parts)
+
+    def cancel(self):
+        self.animations.clear()
+        self.dirty.clear()
+        if self.after_id is not None:
+            try: self.root.after_cancel(self.after_id)
+            except: pass
+            self.after_id = None
@@ -0,0 +1,113 @@
+import json
+import os
+import sqlite3
+
+INSERT_BATCH = 10000
+
+def db_path_for(profile_path):
+    return os.path.splitext(profile_path)[0] + ".history.db"
+
+class HistoryDB:
+    # Same interface as HistoryLog, backed by SQLite so stats and exports are indexed queries instead of scans
+    def __init__(self, path, read_only=False):
+        self.path = path
+        if read_only:
+            # Worker threads get their own connection; WAL lets it read while the UI thread inserts
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            self.count = self.conn.execute("SELECT COUNT(*) FROM spins").fetchone()[0]
+            return
+        self.conn = sqlite3.connect(path)
+        # WAL lets exports read on their own connection while spins keep being written
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS spins ("
+            "id INTEGER PRIMARY KEY, time TEXT NOT NULL, player TEXT NOT NULL, result TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS spins_result ON spins(result)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS spins_player ON spins(player, result)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS spins_time ON spins(time)")
+
+        # Running totals kept by triggers, so the dashboard reads a handful of rows instead of grouping millions
+        self.conn.execute("CREATE TABLE IF NOT EXISTS player_totals (player TEXT NOT NULL, result TEXT NOT NULL, n INTEGER NOT NULL, PRIMARY KEY (player, result))")
+        self.conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS spins_totals AFTER INSERT ON spins BEGIN "
+            "INSERT INTO player_totals (player, result, n) VALUES (NEW.player, NEW.result, 1) "
+            "ON CONFLICT (player, result) DO UPDATE SET n = n + 1; END"
+        )
+        self.count = self.conn.execute("SELECT COUNT(*) FROM spins").fetchone()[0]
+        if self.count and not self.conn.execute("SELECT 1 FROM player_totals LIMIT 1").fetchone():
+            self.conn.execute("INSERT INTO player_totals SELECT player, result, COUNT(*) FROM spins GROUP BY player, result")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.count
+
+    def reader(self):
+        return HistoryDB(self.path, read_only=True)
+
+    def __iter__(self):
+        for (data,) in self.conn.execute("SELECT data FROM spins ORDER BY id"):
+            yield json.loads(data)
+
+    def row(self, entry):
+        return (entry.get("time", ""), entry.get("player", "Guest"), entry.get("result", ""), json.dumps(entry, separators=(",", ":")))
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        # One transaction per batch instead of one per row
+        batch = []
+        for entry in entries:
+            batch.append(self.row(entry))
+            if len(batch) >= INSERT_BATCH:
+                self.insert(batch)
+                batch = []
+        if batch:
+            self.insert(batch)
+
+    def insert(self, rows):
+        with self.conn:
+            self.conn.executemany("INSERT INTO spins (time, player, result, data) VALUES (?, ?, ?, ?)", rows)
+        self.count += len(rows)
+
+    def page(self, offset, limit):
+        rows = self.conn.execute("SELECT data FROM spins ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
+        return [json.loads(data) for (data,) in rows]
+
+    def iter_newest(self, start=None, end=None):
+        # start/end are "YYYY-MM-DD HH:MM:SS" prefixes; the stored format sorts correctly as text
+        sql = "SELECT data FROM spins"
+        where, args = [], []
+        if start:
+            where.append("time >= ?")
+            args.append(start)
+        if end:
+            where.append("time < ?")
+            args.append(end)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        for (data,) in self.conn.execute(sql + " ORDER BY id DESC", args):
+            yield json.loads(data)
+
+    def result_counts(self):
+        return dict(self.conn.execute("SELECT result, SUM(n) FROM player_totals GROUP BY result"))
+
+    def player_stats(self):
+        stats = {}
+        for player, result, n in self.conn.execute("SELECT player, result, n FROM player_totals"):
+            entry = stats.setdefault(player, {"spins": 0, "results": {}})
+            entry["spins"] += n
+            entry["results"][result] = n
+        return stats
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM spins")
+            self.conn.execute("DELETE FROM player_totals")
+        self.count = 0
+
+    def close(self):
+        try: self.conn.close()
+        except: pass
@@ -0,0 +1,208 @@
+import csv
+import json
+import os
+import struct
+import tempfile
+import threading
+import numpy as np
+
+COLUMNAR_MAGIC = b"WOFCOL1\n"
+ROW_GROUP = 65536
+
+CSV_COLUMNS = ["Time", "Player", "Result", "Seed", "Spin"]
+
+def wheel_results(entry):
+    # Older entries only have the joined string, which cannot be split back safely: option names may contain " + "
+    return entry.get("results") or []
+
+def export_csv(entries, path, on_row=None):
+    # The header needs the widest spin's wheel count, known only at the end, so rows are spooled to a
+    # temp file first and then copied under the header, padded to one column per wheel
+    max_wheels = 0
+    with tempfile.TemporaryFile("w+", newline="", encoding="utf-8") as spool:
+        writer = csv.writer(spool)
+        for n, entry in enumerate(entries, 1):
+            results = wheel_results(entry)
+            max_wheels = max(max_wheels, len(results))
+            writer.writerow([entry.get("time", ""), entry.get("player", "Guest"), entry.get("result", ""),
+                             entry.get("seed", ""), entry.get("spin", "")] + results)
+            if on_row and not on_row(n): return False
+        spool.seek(0)
+        width = len(CSV_COLUMNS) + max_wheels
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            out = csv.writer(f)
+            out.writerow(CSV_COLUMNS + [f"Wheel {k + 1}" for k in range(max_wheels)])
+            for row in csv.reader(spool):
+                out.writerow(row + [""] * (width - len(row)))
+    return True
+
+class ColumnarWriter:
+    # A small Parquet-like file: row groups of raw little-endian columns, strings dictionary-encoded into
+    # one shared table, and a JSON footer with the offsets. read_columnar loads it back as NumPy arrays.
+    def __init__(self, path):
+        self.f = open(path, "wb")
+        self.f.write(COLUMNAR_MAGIC)
+        self.dictionary = {}
+        self.row_groups = []
+        self.rows = 0
+        self.max_wheels = 0
+        self.reset()
+
+    def reset(self):
+        self.buf = {"time": [], "player": [], "result": [], "seed": [], "spin": [], "wheels": []}
+
+    def code(self, s):
+        return self.dictionary.setdefault(s, len(self.dictionary))
+
+    def add(self, entry):
+        b = self.buf
+        b["time"].append(entry.get("time") or "NaT")
+        b["player"].append(self.code(entry.get("player", "Guest")))
+        b["result"].append(self.code(entry.get("result", "")))
+        b["seed"].append(entry.get("seed", -1))
+        b["spin"].append(entry.get("spin", -1))
+        b["wheels"].append([self.code(r) for r in wheel_results(entry)])
+        if len(b["time"]) >= ROW_GROUP:
+            self.flush()
+
+    def flush(self):
+        b = self.buf
+        n = len(b["time"])
+        if not n: return
+        wheels = max(len(w) for w in b["wheels"])
+        self.max_wheels = max(self.max_wheels, wheels)
+        wheel_codes = np.full((n, wheels), -1, dtype="<i4")
+        for i, w in enumerate(b["wheels"]):
+            wheel_codes[i, :len(w)] = w
+        try:
+            times = np.array(b["time"], dtype="datetime64[s]").astype("<i8")
+        except ValueError:
+            times = np.array([self.parse_time(t) for t in b["time"]], dtype="<i8")
+        columns = {
+            "time": times,
+            "player": np.array(b["player"], dtype="<i4"),
+            "result": np.array(b["result"], dtype="<i4"),
+            # Seeds are 63-bit, so they fit int64 with -1 meaning "not recorded"
+            "seed": np.array(b["seed"], dtype="<i8"),
+            "spin": np.array(b["spin"], dtype="<i8"),
+        }
+        for k in range(wheels):
+            columns[f"wheel_{k + 1}"] = np.ascontiguousarray(wheel_codes[:, k])
+
+        group = {"rows": n, "columns": {}}
+        for name, arr in columns.items():
+            group["columns"][name] = [self.f.tell(), arr.dtype.str, arr.nbytes]
+            self.f.write(arr.tobytes())
+        self.row_groups.append(group)
+        self.rows += n
+        self.reset()
+
+    def parse_time(self, t):
+        try: return int(np.datetime64(t, "s").astype("<i8"))
+        except: return int(np.datetime64("NaT").astype("<i8"))
+
+    def close(self):
+        self.flush()
+        footer = json.dumps({
+            "rows": self.rows,
+            "time_unit": "s",
+            "max_wheels": self.max_wheels,
+            "dictionary": list(self.dictionary),
+            "row_groups": self.row_groups
+        }).encode("utf-8")
+        self.f.write(footer)
+        self.f.write(struct.pack("<Q", len(footer)))
+        self.f.write(COLUMNAR_MAGIC)
+        self.f.close()
+
+def export_columnar(entries, path, on_row=None):
+    writer = ColumnarWriter(path)
+    try:
+        for n, entry in enumerate(entries, 1):
+            writer.add(entry)
+            if on_row and not on_row(n): return False
+    finally:
+        writer.close()
+    return True
+
+def read_columnar(path):
+    # Returns ({column: array}, dictionary); string columns are int32 codes into the dictionary
+    with open(path, "rb") as f:
+        f.seek(-(8 + len(COLUMNAR_MAGIC)), 2)
+        size = struct.unpack("<Q", f.read(8))[0]
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError("not a columnar history export")
+        f.seek(-(8 + len(COLUMNAR_MAGIC) + size), 2)
+        meta = json.loads(f.read(size))
+        names = ["time", "player", "result", "seed", "spin"] + [f"wheel_{k + 1}" for k in range(meta["max_wheels"])]
+        parts = {name: [] for name in names}
+        for group in meta["row_groups"]:
+            for name in names:
+                if name not in group["columns"]:
+                    parts[name].append(np.full(group["rows"], -1, dtype="<i4"))
+                    continue
+                offset, dtype, nbytes = group["columns"][name]
+                f.seek(offset)
+                parts[name].append(np.frombuffer(f.read(nbytes), dtype=dtype))
+    columns = {}
+    for name, chunks in parts.items():
+        columns[name] = np.concatenate(chunks) if chunks else np.zeros(0, dtype="<i4")
+    columns["time"] = columns["time"].astype("datetime64[s]")
+    return columns, meta["dictionary"]
+
+EXPORTERS = {"CSV": export_csv, "Columnar": export_columnar}
+
+class ExportJob:
+    # Streams the history from its own reader on a thread; the UI polls progress and may cancel
+    def __init__(self, open_reader, path, fmt="CSV", start=None, end=None):
+        self.open_reader = open_reader
+        self.path = path
+        self.fmt = fmt
+        self.start_time = start
+        self.end_time = end
+        self.total = 0
+        self.done_rows = 0
+        self.finished = False
+        self.cancelled = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled = True
+
+    def on_row(self, n):
+        self.done_rows = n
+        return not self.cancelled
+
+    def run(self):
+        # Written beside the target and renamed on success, so a failed or cancelled export never leaves a partial file
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".export-", suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path)))
+            os.close(fd)
+            reader = self.open_reader()
+            try:
+                # An upper bound when filtering by date; the bar jumps to full when the scan ends
+                self.total = len(reader)
+                completed = EXPORTERS[self.fmt](reader.iter_newest(self.start_time, self.end_time), tmp_path, self.on_row)
+            finally:
+                reader.close()
+            if completed:
+                os.replace(tmp_path, self.path)
+            else:
+                self.cancelled = True
+        except Exception as e:
+            self.error = e
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                try: os.remove(tmp_path)
+                except OSError: pass
+        self.finished = True
+
+    def progress(self):
+        if self.finished: return 1.0
+        return self.done_rows / self.total if self.total else 0.0
@@ -0,0 +1,152 @@
+import json
+import os
+
+SEGMENT_ENTRIES = 2000
+
+def log_dir_for(profile_path):
+    # profiles/default.json keeps its spins in profiles/default.history/
+    return os.path.splitext(profile_path)[0] + ".history"
+
+class HistoryLog:
+    # Spins are appended oldest to newest as one JSON object per line. Full segments are sealed and never
+    # rewritten, so an append costs the same however long the history is.
+    def __init__(self, directory, segment_entries=SEGMENT_ENTRIES, read_only=False):
+        self.directory = directory
+        self.segment_entries = segment_entries
+        self.segments = []
+        self.counts = {}
+        self.file = None
+        self.cache = (None, 0, None)
+        if os.path.isdir(directory):
+            self.segments = sorted(int(f[:-6]) for f in os.listdir(directory) if f.endswith(".jsonl") and f[:-6].isdigit())
+        # Only the last segment is ever appended to; every sealed one holds exactly segment_entries lines
+        for seg in self.segments[:-1]:
+            self.counts[seg] = segment_entries
+        if self.segments:
+            self.counts[self.segments[-1]] = self.count_lines(self.segments[-1], repair=not read_only)
+
+    def reader(self):
+        # An independent view for worker threads; it never repairs or writes, so it cannot race the appender
+        return HistoryLog(self.directory, self.segment_entries, read_only=True)
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def __iter__(self):
+        # Oldest first, one segment in memory at a time
+        for seg in list(self.segments):
+            yield from self.read_segment(seg)
+
+    def path(self, seg):
+        return os.path.join(self.directory, f"{seg:08d}.jsonl")
+
+    def count_lines(self, seg, repair=False):
+        with open(self.path(seg), "rb+" if repair else "rb") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if repair and end != len(data):
+                # Drop a line torn by a crash mid-append so the next entry starts on a fresh line
+                f.truncate(end)
+        return data.count(b"\n")
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        for entry in entries:
+            if not self.segments or self.counts[self.segments[-1]] >= self.segment_entries:
+                self.rotate()
+            if self.file is None:
+                self.file = open(self.path(self.segments[-1]), "a", encoding="utf-8")
+            self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self.counts[self.segments[-1]] += 1
+        if self.file is not None:
+            self.file.flush()
+
+    def rotate(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.close()
+        seg = self.segments[-1] + 1 if self.segments else 1
+        open(self.path(seg), "a").close()
+        self.segments.append(seg)
+        self.counts[seg] = 0
+
+    def read_segment(self, seg):
+        if self.cache[:2] == (seg, self.counts.get(seg)): return self.cache[2]
+        entries = []
+        try:
+            with open(self.path(seg), "r", encoding="utf-8") as f:
+                for line in f:
+                    try: entries.append(json.loads(line))
+                    except: pass
+        except OSError:
+            return entries
+        # Sealed segments are assumed full until read; a corrupt or blank line makes them hold fewer spins
+        self.counts[seg] = len(entries)
+        # Keep the last segment read for the next page; an append changes its count and so invalidates it
+        self.cache = (seg, self.counts.get(seg), entries)
+        return entries
+
+    def page(self, offset, limit):
+        # Newest first; whole segments before the requested page are skipped by their line counts
+        result = []
+        for seg in reversed(self.segments):
+            n = self.counts[seg]
+            if offset >= n:
+                offset -= n
+                continue
+            entries = self.read_segment(seg)
+            if offset >= len(entries):
+                # Fewer spins than assumed; the rest of the offset carries into the next segment
+                offset -= len(entries)
+                continue
+            stop = len(entries) - offset
+            start = max(0, stop - (limit - len(result)))
+            result.extend(reversed(entries[start:stop]))
+            offset = 0
+            if len(result) >= limit: break
+        return result
+
+    def iter_newest(self, start=None, end=None):
+        # start/end are "YYYY-MM-DD HH:MM:SS" prefixes; the stored format sorts correctly as text
+        for seg in reversed(list(self.segments)):
+            for entry in reversed(self.read_segment(seg)):
+                t = entry.get("time", "")
+                if start and t < start: continue
+                if end and t >= end: continue
+                yield entry
+
+    def result_counts(self):
+        counts = {}
+        for entry in self:
+            counts[entry["result"]] = counts.get(entry["result"], 0) + 1
+        return counts
+
+    def player_stats(self):
+        stats = {}
+        for entry in self:
+            player = stats.setdefault(entry.get("player", "Guest"), {"spins": 0, "results": {}})
+            player["spins"] += 1
+            player["results"][entry["result"]] = player["results"].get(entry["result"], 0) + 1
+        return stats
+
+    def clear(self):
+        self.close()
+        for seg in self.segments:
+            try: os.remove(self.path(seg))
+            except OSError: pass
+        try: os.rmdir(self.directory)
+        except OSError: pass
+        self.segments = []
+        self.counts = {}
+        self.cache = (None, 0, None)
+
+    def close(self):
+        if self.file is not None:
+            try:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            except OSError:
+                pass
+            self.file.close()
+            self.file = None
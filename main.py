@@ -1,17 +1,27 @@
+import time
+START_TIME = time.perf_counter()
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox, filedialog
-import time
-import threading
 import random
 from constants import THEMES, ease_out_quart
 from audio_manager import AudioManager
 from profile_manager import ProfileManager
-from dialogs import OptionDialog, ListboxDialog, HistoryDialog
 from wheel_renderer import WheelRenderer
+from slice_table import SliceTableCache
+from frame_scheduler import FrameScheduler
+from spin_physics import SpinPhysics, predict_spins
 from twitch_client import TwitchClient
-from stats_dashboard import StatsDashboard
+from spin_queue import SpinQueue, POLICIES
 from discord_rpc import DiscordWebhook
+from startup_timer import StartupTimer
+
+startup = StartupTimer(START_TIME)
+startup.mark("imports")
+
+TWITCH_POLL_MS = 100
+# Pause between a chat spin's result and the next queued spin, so viewers get to see who won
+SPIN_QUEUE_GAP_MS = 3000
 
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
@@ -22,6 +32,7 @@ class WheelOfLuckApp(ctk.CTk):
         self.title("✨ Premium Wheel of Fortune ✨")
         self.geometry("1100x800")
         self.minsize(900, 600)
+        startup.mark("window")
 
         self.app_state = {}
         self.angles = []
@@ -36,50 +47,97 @@ class WheelOfLuckApp(ctk.CTk):
         self.spin_start_time = 0
         self.spin_start_angles = []
         self.spin_target_angles = []
+        self.pending_result = None
+        self.pending_replay = None
+        
+        # Every spin draws from its own stream of the session seed, so any spin can be reproduced from (seed, index)
+        self.session_seed = random.SystemRandom().getrandbits(63)
+        self.spin_index = 0
         
         self.active_wheel_index = 0
+        self.slice_tables = SliceTableCache()
+        self.physics = SpinPhysics()
         self.party_mode = False
-        self.particle_thread_running = True
         
         self.audio_manager = AudioManager()
-        self.profile_manager = ProfileManager(self.app_state, self.on_profile_changed)
-        self.twitch_client = TwitchClient("", "", self.trigger_spin_from_twitch)
+        self.profile_manager = ProfileManager(self.app_state, self.on_profile_changed, self, self.sync_history_backend)
+        self.twitch_client = TwitchClient("", "")
+        self.twitch_poll_id = None
+        self.sub_wheel_pending = False
+        self.spin_queue = SpinQueue(self.trigger_spin_from_twitch, self.is_wheel_busy)
         self.discord_webhook = DiscordWebhook()
+        self.controls_ready = False
         
         for k in ["1", "2", "3", "4", "5"]:
             self.bind(f"<KeyPress-{k}>", lambda e, key=k: self.audio_manager.play_soundboard(key, self.app_state.get("soundboard", {})))
         
         self.setup_ui()
-        self.renderer = WheelRenderer(self.canvas)
+        self.renderer = WheelRenderer(self.canvas, self.slice_tables)
+        self.scheduler = FrameScheduler(self, self.render_frame)
+        startup.mark("canvas")
         
         self.profile_manager.initialize()
-        
-        self.particle_thread = threading.Thread(target=self.particle_worker, daemon=True)
-        self.particle_thread.start()
+        startup.mark("profile")
         
         self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.bind("<Configure>", self.on_resize)
-
-    def trigger_spin_from_twitch(self):
-        self.after(0, self.on_spin_press, None)
+        self.after(0, self.finish_startup)
+
+    def finish_startup(self):
+        # The wheel paints first; the sidebar and audio come up once it is on screen
+        self.update_idletasks()
+        startup.mark("first paint")
+        self.build_controls()
+        self.sync_controls()
+        self.audio_manager.start()
+        startup.mark("sidebar")
+        startup.report()
+
+    def poll_twitch(self):
+        # Chat is parsed on the client's thread; the UI only picks up commands, a batch per poll
+        self.twitch_poll_id = None
+        msgs = self.twitch_client.drain()
+        for msg in msgs:
+            if msg.command_word() == "!spin":
+                self.spin_queue.submit(msg.tags.get("display-name") or msg.nick, msg.text)
+        if msgs: self.update_queue_label()
+        if self.twitch_client.running:
+            self.twitch_poll_id = self.after(TWITCH_POLL_MS, self.poll_twitch)
+
+    def trigger_spin_from_twitch(self, request=None):
+        # Chat cannot answer a dialog; an unspinnable wheel just fails the request
+        if self.spinning or not self.wheels_spinnable(): return False
+        self.on_spin_press(None)
+        if not self.charging: return False
         self.after(1000, self.on_spin_release, None)
+        return True
+
+    def wheels_spinnable(self):
+        return all(w["options"] for w in self.app_state.get("wheels", []))
+
+    def is_wheel_busy(self):
+        return self.spinning or self.charging or self.sub_wheel_pending
+
+    def finish_queued_spin(self):
+        self.spin_queue.on_spin_finished()
+        self.update_queue_label()
+
+    def update_queue_label(self):
+        if not self.controls_ready: return
+        m = self.spin_queue.metrics()
+        dropped = m["duplicate"] + m["cooldown"] + m["rate"] + m["busy"] + m["full"] + m["failed"]
+        self.spin_queue_label.configure(text=f"Chat spins waiting: {m['depth']} (peak {m['peak_depth']}), {dropped} dropped")
 
     def on_profile_changed(self):
-        self.update_profile_dropdown()
-        self.theme_var.set(self.app_state.get("theme", "Default"))
-        self.elimination_var.set(self.app_state.get("elimination_mode", False))
-        self.particle_style_var.set(self.app_state.get("particle_style", "Confetti"))
-        self.layout_style_var.set(self.app_state.get("layout_style", "Circle"))
-        
         wheels = self.app_state.get("wheels", [])
         if self.active_wheel_index >= len(wheels):
             self.active_wheel_index = max(0, len(wheels)-1)
-        self.update_wheel_tabs()
-        players = self.app_state.get("players", ["Guest"])
-        if hasattr(self, 'player_dropdown'):
-            self.player_dropdown.configure(values=players)
-            if self.player_var.get() not in players:
-                self.player_var.set(players[0])
+        self.spin_queue.policy = self.app_state.get("spin_queue_policy", "Queue")
+        self.spin_queue.clear()
+        if self.controls_ready:
+            self.sync_controls()
+        
+        self.slice_tables.invalidate()
         
         # Reset angles based on wheels count
         self.angles = [0] * len(wheels)
@@ -88,11 +146,39 @@ class WheelOfLuckApp(ctk.CTk):
         self.angular_velocities = [0.0] * len(wheels)
         
         self.audio_manager.bg_music = self.app_state.get("bg_music")
+        sounds = [opt.get("sound") for w in wheels for opt in w["options"]]
+        sounds += list(self.app_state.get("soundboard", {}).values())
+        self.audio_manager.preload(sounds)
+        self.audio_manager.prerender_announcements([opt["name"] for w in wheels for opt in w["options"]])
         if self.audio_manager.bg_music and self.audio_manager.enabled:
             self.audio_manager.play_bg_music(0.3)
             
         self.draw_wheel()
 
+    def sync_history_backend(self):
+        # While spins are being moved the menu shows where they are going and cannot be changed
+        if not self.controls_ready: return
+        migration = self.profile_manager.migration
+        self.history_backend_var.set(migration.backend if migration else self.app_state.get("history_backend", "JSONL"))
+        self.history_backend_dropdown.configure(state="disabled" if migration else "normal")
+
+    def sync_controls(self):
+        self.update_profile_dropdown()
+        self.theme_var.set(self.app_state.get("theme", "Default"))
+        self.elimination_var.set(self.app_state.get("elimination_mode", False))
+        self.instant_spin_var.set(self.app_state.get("instant_spin", False))
+        self.sync_history_backend()
+        self.particle_style_var.set(self.app_state.get("particle_style", "Confetti"))
+        self.particle_render_var.set(self.app_state.get("particle_render", "Canvas Items"))
+        self.layout_style_var.set(self.app_state.get("layout_style", "Circle"))
+        self.render_mode_var.set(self.app_state.get("render_mode", "Vector"))
+        self.spin_queue_policy_var.set(self.app_state.get("spin_queue_policy", "Queue"))
+        self.update_wheel_tabs()
+        players = self.app_state.get("players", ["Guest"])
+        self.player_dropdown.configure(values=players)
+        if self.player_var.get() not in players:
+            self.player_var.set(players[0])
+
     def update_profile_dropdown(self):
         profiles = self.profile_manager.get_profiles_list()
         self.profile_dropdown.configure(values=profiles)
@@ -112,6 +198,10 @@ class WheelOfLuckApp(ctk.CTk):
                 self.active_wheel_index = i
                 break
 
+    def on_options_changed(self, wheel_idx=None):
+        self.slice_tables.invalidate(self.active_wheel_index if wheel_idx is None else wheel_idx)
+        self.draw_wheel()
+
     def get_active_options(self):
         wheels = self.app_state.get("wheels", [])
         if self.active_wheel_index < len(wheels):
@@ -129,6 +219,22 @@ class WheelOfLuckApp(ctk.CTk):
         self.logo_label = ctk.CTkLabel(self.sidebar_frame, text="Wheel of Fortune\n✨", font=ctk.CTkFont(size=24, weight="bold"))
         self.logo_label.grid(row=0, column=0, padx=20, pady=(20, 10))
 
+        self.main_frame = ctk.CTkFrame(self, corner_radius=10)
+        self.main_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
+        self.main_frame.grid_rowconfigure(1, weight=1)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+
+        self.result_label = ctk.CTkLabel(self.main_frame, text="Ready to Spin!", font=ctk.CTkFont(size=28, weight="bold"), text_color="#fdcb6e")
+        self.result_label.grid(row=0, column=0, pady=(20, 10))
+        
+        self.hamburger_btn = ctk.CTkButton(self.main_frame, text="≡", width=40, height=40, font=ctk.CTkFont(size=20), command=self.toggle_sidebar, fg_color="transparent", hover_color="#2d3436")
+        self.hamburger_btn.place(x=10, y=10)
+
+        self.canvas_bg = self.main_frame._apply_appearance_mode(self.main_frame._fg_color)
+        self.canvas = tk.Canvas(self.main_frame, bg=self.canvas_bg, highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew", padx=20, pady=20)
+
+    def build_controls(self):
         self.controls_frame = ctk.CTkScrollableFrame(self.sidebar_frame)
         self.controls_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
         
@@ -190,14 +296,17 @@ class WheelOfLuckApp(ctk.CTk):
         ctk.CTkButton(tab_frame, text="-", width=30, fg_color="#d63031", hover_color="#ff7675", command=remove_wheel).pack(side="left")
 
         # Options Management
+        # Dialogs and the stats dashboard load with the sidebar, after the wheel has painted
+        from dialogs import OptionDialog, ListboxDialog, HistoryDialog, ExportDialog
+        from stats_dashboard import StatsDashboard
         def show_add():
-            OptionDialog.show(self, "Add Option", self.get_active_options(), self.app_state.get("wheels", []), self.draw_wheel, self.profile_manager.save_current_profile)
+            OptionDialog.show(self, "Add Option", self.get_active_options(), self.app_state.get("wheels", []), self.on_options_changed, self.profile_manager.save_current_profile)
         def show_edit():
-            ListboxDialog.show(self, "Edit Option", self.get_active_options(), lambda idx, d: OptionDialog.show(self, "Edit Option", self.get_active_options(), self.app_state.get("wheels", []), self.draw_wheel, self.profile_manager.save_current_profile, idx), "Edit", is_edit=True)
+            ListboxDialog.show(self, "Edit Option", self.get_active_options(), lambda idx, d: OptionDialog.show(self, "Edit Option", self.get_active_options(), self.app_state.get("wheels", []), self.on_options_changed, self.profile_manager.save_current_profile, idx), "Edit", is_edit=True)
         def show_remove():
             def do_remove(idx, d):
                 self.get_active_options().pop(idx)
-                self.draw_wheel()
+                self.on_options_changed()
                 self.profile_manager.save_current_profile()
             ListboxDialog.show(self, "Remove Option", self.get_active_options(), do_remove, "Remove")
             
@@ -220,7 +329,7 @@ class WheelOfLuckApp(ctk.CTk):
                 wheels = self.app_state.get("wheels", [])
                 if self.active_wheel_index < len(wheels):
                     wheels[self.active_wheel_index]["options"] = list(presets[val])
-                    self.draw_wheel()
+                    self.on_options_changed()
                     self.profile_manager.save_current_profile()
             self.preset_var.set("Select Preset...")
 
@@ -269,12 +378,27 @@ class WheelOfLuckApp(ctk.CTk):
         self.layout_dropdown = ctk.CTkOptionMenu(self.controls_frame, variable=self.layout_style_var, values=["Circle", "Polygon", "Vertical Slot"], command=change_layout)
         self.layout_dropdown.pack(fill="x", pady=(0, 5))
         
+        self.render_mode_var = ctk.StringVar(value="Vector")
+        def change_render_mode(val):
+            self.app_state["render_mode"] = val
+            self.draw_wheel()
+            self.profile_manager.save_current_profile()
+        self.render_mode_dropdown = ctk.CTkOptionMenu(self.controls_frame, variable=self.render_mode_var, values=["Vector", "Sprite"], command=change_render_mode)
+        self.render_mode_dropdown.pack(fill="x", pady=(0, 5))
+        
         self.particle_style_var = ctk.StringVar(value="Confetti")
         def change_pstyle(val):
             self.app_state["particle_style"] = val
             self.profile_manager.save_current_profile()
         self.particle_dropdown = ctk.CTkOptionMenu(self.controls_frame, variable=self.particle_style_var, values=["Confetti", "Falling Money", "Fireworks"], command=change_pstyle)
         self.particle_dropdown.pack(fill="x", pady=(0, 5))
+        
+        self.particle_render_var = ctk.StringVar(value="Canvas Items")
+        def change_prender(val):
+            self.app_state["particle_render"] = val
+            self.profile_manager.save_current_profile()
+        self.particle_render_dropdown = ctk.CTkOptionMenu(self.controls_frame, variable=self.particle_render_var, values=["Canvas Items", "Raster"], command=change_prender)
+        self.particle_render_dropdown.pack(fill="x", pady=(0, 5))
 
         def load_bg():
             path = filedialog.askopenfilename(filetypes=[("Image Files", "*.png *.jpg *.jpeg")])
@@ -304,6 +428,19 @@ class WheelOfLuckApp(ctk.CTk):
         self.elimination_toggle = ctk.CTkSwitch(self.controls_frame, text="Winner Elimination", variable=self.elimination_var, command=toggle_elimination)
         self.elimination_toggle.pack(fill="x", pady=(0, 5))
         
+        self.instant_spin_var = ctk.BooleanVar(value=False)
+        def toggle_instant_spin():
+            self.app_state["instant_spin"] = self.instant_spin_var.get()
+            self.profile_manager.save_current_profile()
+        self.instant_spin_toggle = ctk.CTkSwitch(self.controls_frame, text="Instant Spin", variable=self.instant_spin_var, command=toggle_instant_spin)
+        self.instant_spin_toggle.pack(fill="x", pady=(0, 5))
+        
+        self.history_backend_var = ctk.StringVar(value="JSONL")
+        def change_history_backend(val):
+            self.profile_manager.set_history_backend(val)
+        self.history_backend_dropdown = ctk.CTkOptionMenu(self.controls_frame, variable=self.history_backend_var, values=["JSONL", "SQLite"], command=change_history_backend)
+        self.history_backend_dropdown.pack(fill="x", pady=(0, 5))
+        
         def toggle_snd():
             state = "ON" if self.audio_manager.toggle_sound() else "OFF"
             self.sound_btn.configure(text=f"Sound: {state}")
@@ -357,13 +494,19 @@ class WheelOfLuckApp(ctk.CTk):
         self.soundboard_btn = ctk.CTkButton(self.controls_frame, text="Soundboard Hotkeys (1-5)", command=configure_soundboard)
         self.soundboard_btn.pack(fill="x", pady=(0, 20))
         
+        def export_history():
+            if not len(self.profile_manager.history):
+                messagebox.showinfo("History", "No history to export.")
+                return
+            ExportDialog.show(self, self.profile_manager.history.reader)
+            
         def show_hist():
-            HistoryDialog.show(self, self.app_state["history"], self.profile_manager.save_current_profile, self.profile_manager.export_history_csv)
+            HistoryDialog.show(self, self.profile_manager.history, self.profile_manager.clear_history, export_history)
         self.history_btn = ctk.CTkButton(self.controls_frame, text="Spin History & Export", command=show_hist)
         self.history_btn.pack(fill="x", pady=(0, 5))
 
         def show_stats():
-            StatsDashboard.show(self, self.app_state["history"], THEMES.get(self.app_state.get("theme", "Default"), THEMES["Default"]))
+            StatsDashboard.show(self, self.profile_manager.get_stats(), THEMES.get(self.app_state.get("theme", "Default"), THEMES["Default"]), self.profile_manager.history.reader)
         self.stats_btn = ctk.CTkButton(self.controls_frame, text="Detailed Statistics", command=show_stats)
         self.stats_btn.pack(fill="x", pady=(0, 20))
 
@@ -406,7 +549,7 @@ class WheelOfLuckApp(ctk.CTk):
         def connect_twitch():
             dialog = ctk.CTkToplevel(self)
             dialog.title("Twitch Auth")
-            dialog.geometry("300x200")
+            dialog.geometry("300x270")
             dialog.attributes("-topmost", True)
             
             ctk.CTkLabel(dialog, text="Channel Name:").pack(pady=5)
@@ -417,17 +560,41 @@ class WheelOfLuckApp(ctk.CTk):
             tok_entry = ctk.CTkEntry(dialog, show="*")
             tok_entry.pack(pady=5)
             
+            # Point this at a local twitch_standin.py to test without the live chat servers
+            ctk.CTkLabel(dialog, text="Server (host:port):").pack(pady=5)
+            server_entry = ctk.CTkEntry(dialog)
+            server_entry.insert(0, f"{self.twitch_client.host}:{self.twitch_client.port}")
+            server_entry.pack(pady=5)
+            
             def do_connect():
                 self.twitch_client.stop()
                 self.twitch_client.channel = chan_entry.get().strip()
                 self.twitch_client.token = tok_entry.get().strip()
+                host, _, port = server_entry.get().strip().rpartition(":")
+                if not host or not port.isdigit():
+                    messagebox.showerror("Twitch", "Server must look like host:port", parent=dialog)
+                    return
+                self.twitch_client.host, self.twitch_client.port = host, int(port)
                 if self.twitch_client.start():
+                    if self.twitch_poll_id is None:
+                        self.poll_twitch()
                     messagebox.showinfo("Twitch", "Connected successfully!", parent=dialog)
                     dialog.destroy()
             ctk.CTkButton(dialog, text="Connect", command=do_connect).pack(pady=10)
             
         self.twitch_btn = ctk.CTkButton(self.controls_frame, text="Connect to Twitch", fg_color="#6441a5", hover_color="#896bc8", command=connect_twitch)
-        self.twitch_btn.pack(fill="x", pady=(0, 20))
+        self.twitch_btn.pack(fill="x", pady=(0, 5))
+
+        ctk.CTkLabel(self.controls_frame, text="When chat spins pile up:").pack(anchor="w", pady=(0, 5))
+        self.spin_queue_policy_var = ctk.StringVar(value="Queue")
+        def change_spin_queue_policy(val):
+            self.app_state["spin_queue_policy"] = val
+            self.spin_queue.policy = val
+            self.profile_manager.save_current_profile()
+        self.spin_queue_policy_dropdown = ctk.CTkOptionMenu(self.controls_frame, variable=self.spin_queue_policy_var, values=POLICIES, command=change_spin_queue_policy)
+        self.spin_queue_policy_dropdown.pack(fill="x", pady=(0, 5))
+        self.spin_queue_label = ctk.CTkLabel(self.controls_frame, text="Chat spins waiting: 0", anchor="w")
+        self.spin_queue_label.pack(fill="x", pady=(0, 20))
 
         self.appearance_mode_label = ctk.CTkLabel(self.sidebar_frame, text="Appearance Mode:", anchor="w")
         self.appearance_mode_label.grid(row=2, column=0, padx=20, pady=(10, 0))
@@ -438,29 +605,21 @@ class WheelOfLuckApp(ctk.CTk):
             self.draw_wheel()
         self.appearance_mode_optionemenu = ctk.CTkOptionMenu(self.sidebar_frame, values=["Dark", "Light", "System"], command=change_app_mode)
         self.appearance_mode_optionemenu.grid(row=3, column=0, padx=20, pady=(10, 20))
-
-        self.main_frame = ctk.CTkFrame(self, corner_radius=10)
-        self.main_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
-        self.main_frame.grid_rowconfigure(1, weight=1)
-        self.main_frame.grid_columnconfigure(0, weight=1)
-
-        self.result_label = ctk.CTkLabel(self.main_frame, text="Ready to Spin!", font=ctk.CTkFont(size=28, weight="bold"), text_color="#fdcb6e")
-        self.result_label.grid(row=0, column=0, pady=(20, 10))
-        
-        self.hamburger_btn = ctk.CTkButton(self.main_frame, text="≡", width=40, height=40, font=ctk.CTkFont(size=20), command=self.toggle_sidebar, fg_color="transparent", hover_color="#2d3436")
-        self.hamburger_btn.place(x=10, y=10)
-
-        self.canvas_bg = self.main_frame._apply_appearance_mode(self.main_frame._fg_color)
-        self.canvas = tk.Canvas(self.main_frame, bg=self.canvas_bg, highlightthickness=0)
-        self.canvas.grid(row=1, column=0, sticky="nsew", padx=20, pady=20)
+        self.controls_ready = True
 
     def draw_wheel(self):
         if hasattr(self, 'renderer'):
             self.renderer.draw_all(self.app_state, self.angles, getattr(self, 'flapper_bends', None))
 
-    def on_resize(self, event):
-        if not self.spinning:
+    def render_frame(self, parts):
+        if "wheel" in parts:
             self.draw_wheel()
+        if "particles" in parts:
+            self.renderer.draw_particles(self.app_state.get("particle_render", "Canvas Items"))
+
+    def on_resize(self, event):
+        # Configure fires for every child widget; the scheduler folds them into one redraw
+        self.scheduler.request_redraw("wheel")
 
     def toggle_party_mode(self):
         self.party_mode = True
@@ -489,8 +648,7 @@ class WheelOfLuckApp(ctk.CTk):
 
     def on_spin_press(self, event):
         if self.spinning: return
-        wheels = self.app_state.get("wheels", [])
-        if any(not w["options"] for w in wheels):
+        if not self.wheels_spinnable():
             messagebox.showwarning("Error", "All wheels must have at least one option!")
             return
             
@@ -498,15 +656,17 @@ class WheelOfLuckApp(ctk.CTk):
         self.charging = True
         self.spin_btn.configure(text="Charging...")
         self.audio_manager.set_bg_volume(1.0)
-        self.animate_charge()
+        self.charge_power = -1
+        self.scheduler.start("charge", self.tick_charge)
 
-    def animate_charge(self):
-        if not self.charging: return
+    def tick_charge(self, dt, now):
+        if not self.charging: return False
         charge_time = time.time() - self.charge_start_time
         power = min(100, int((charge_time / 2.0) * 100))
-        self.spin_btn.configure(text=f"Power: {power}%")
-        if power < 100:
-            self.after(50, self.animate_charge)
+        if power != self.charge_power:
+            self.charge_power = power
+            self.spin_btn.configure(text=f"Power: {power}%")
+        return power < 100
 
     def on_spin_release(self, event):
         if not self.charging: return
@@ -515,96 +675,80 @@ class WheelOfLuckApp(ctk.CTk):
         power_factor = min(2.0, charge_time) / 2.0
         
         wheels = self.app_state.get("wheels", [])
+        self.spin_index += 1
+        rng = random.Random(f"{self.session_seed}:{self.spin_index}")
         self.angular_velocities = []
         for i in range(len(wheels)):
             base_vel = 15.0 + (power_factor * 25.0)
-            self.angular_velocities.append(base_vel + random.uniform(0, 5))
+            self.angular_velocities.append(base_vel + rng.uniform(0, 5))
 
         self.spinning = True
         self.result_label.configure(text="Spinning...", text_color="#00cec9")
         self.spin_btn.configure(state="disabled", text="SPIN!")
+        self.renderer.clear_popup()
+        
+        tables = [self.slice_tables.get(i, w["options"]) for i, w in enumerate(wheels)]
+        # The outcome is known before the wheel moves, so slow work can start while it animates
+        final_angles, winners = predict_spins(self.angles, self.angular_velocities, tables)
+        # Pulls in the fairness tools and SQLite, which nothing needs before the first spin
+        from spin_replay import make_replay
+        self.pending_replay = make_replay(self.angles, self.angular_velocities, [w["options"] for w in wheels])
+        self.pending_result = self.build_result(winners.tolist())
+        self.send_result_embed(*self.pending_result)
+        self.flapper_bends = [0.0] * len(wheels)
         
-        for i in range(len(wheels)):
-            self.last_slice_indices[i] = self.get_slice_at_angle(i, self.angles[i])
-            self.flapper_bends[i] = 0.0
-            
-        self.last_frame_time = time.time()
-        self.animate_spin()
+        if self.app_state.get("instant_spin", False):
+            self.angles = final_angles.tolist()
+            self.last_slice_indices = winners.tolist()
+            self.spinning = False
+            self.draw_wheel()
+            self.audio_manager.set_bg_volume(0.1)
+            self.show_result()
+            return
+        
+        self.physics.start(self.angles, self.angular_velocities, tables)
+        self.last_slice_indices = self.physics.last_slices.tolist()
+        self.scheduler.start("spin", self.tick_spin)
 
     def get_slice_at_angle(self, wheel_idx, angle):
         wheels = self.app_state.get("wheels", [])
         if wheel_idx >= len(wheels): return 0
         options = wheels[wheel_idx]["options"]
         if not options: return 0
+        return self.slice_tables.get(wheel_idx, options).index_at(angle)
+
+    def tick_spin(self, dt, now):
+        if not self.spinning: return False
         
-        total_weight = sum(opt.get("weight", 1) for opt in options)
-        pointer_angle = 90
-        effective_angle = (pointer_angle - angle) % 360
-        current_angle_sum = 0
-        for i, opt in enumerate(options):
-            angle_extent = (opt.get("weight", 1) / total_weight) * 360
-            if current_angle_sum <= effective_angle < current_angle_sum + angle_extent:
-                return i
-            current_angle_sum += angle_extent
-        return 0
-
-    def animate_spin(self):
-        if not self.spinning: return
-        
-        current_time = time.time()
-        dt = current_time - self.last_frame_time
-        if dt > 0.1: dt = 0.016
-        self.last_frame_time = current_time
-        
-        wheels = self.app_state.get("wheels", [])
-        all_stopped = True
-        base_friction = 2.0
-        
-        for i in range(len(wheels)):
-            vel = self.angular_velocities[i]
-            if vel > 0:
-                all_stopped = False
+        # Physics runs in fixed steps, so a slow frame changes how smooth the spin looks, never where it lands
+        crossings = self.physics.advance(dt)
+        crossed = int(crossings.sum())
+        if crossed:
+            self.audio_manager.play_ticks(crossed, float(self.physics.velocities[crossings > 0].max()))
                 
-                self.angles[i] = (self.angles[i] + vel * (dt * 60.0)) % 360
-                
-                current_slice = self.get_slice_at_angle(i, self.angles[i])
-                if current_slice != self.last_slice_indices[i]:
-                    self.last_slice_indices[i] = current_slice
-                    vel -= 1.0 # Peg resistance
-                    if vel < 0: vel = 0
-                    self.flapper_bends[i] = 1.0 # Snap flapper fully back
-                    threading.Thread(target=self.audio_manager.play_spin_sound, daemon=True).start()
-                
-                if self.flapper_bends[i] > 0:
-                    self.flapper_bends[i] -= dt * 5.0
-                    if self.flapper_bends[i] < 0: self.flapper_bends[i] = 0.0
-                
-                vel -= base_friction * (dt * 60.0)
-                if vel < 0: vel = 0
-                self.angular_velocities[i] = vel
-                
-        self.draw_wheel()
+        self.angles = self.physics.render_angles().tolist()
+        self.flapper_bends = self.physics.render_bends().tolist()
+        self.last_slice_indices = self.physics.last_slices.tolist()
+        self.scheduler.request_redraw("wheel")
         
-        if all_stopped:
+        if self.physics.is_stopped():
             self.spinning = False
             self.audio_manager.set_bg_volume(0.1)
             self.show_result()
-        else:
-            self.after(16, self.animate_spin)
+            return False
+        return True
 
-    def show_result(self):
+    def build_result(self, slice_indices):
         wheels = self.app_state.get("wheels", [])
         results = []
         for i in range(len(wheels)):
-            idx = self.get_slice_at_angle(i, self.angles[i])
+            idx = slice_indices[i]
             opt = wheels[i]["options"][idx]
             results.append((i, idx, opt["name"], opt.get("image", ""), opt.get("sound", ""), opt.get("sub_wheel", "None")))
-            
         final_str = " + ".join([r[2] for r in results])
-        self.last_result = final_str
-        
-        self.result_label.configure(text=f"🎉 Winner: {final_str} 🎉", text_color="#fdcb6e")
-        self.spin_btn.configure(state="normal", text="Hold to SPIN!")
+        return results, final_str
+
+    def send_result_embed(self, results, final_str):
         image_path = results[0][3] if len(results) == 1 and results[0][3] else None
         self.discord_webhook.send_embed(
             title="🎉 We have a winner! 🎉",
@@ -612,8 +756,25 @@ class WheelOfLuckApp(ctk.CTk):
             color=0xfdcb6e,
             image_path=image_path
         )
+
+    def show_result(self):
+        if self.pending_result:
+            results, final_str = self.pending_result
+            self.pending_result = None
+        else:
+            wheels = self.app_state.get("wheels", [])
+            results, final_str = self.build_result([self.get_slice_at_angle(i, self.angles[i]) for i in range(len(wheels))])
+            self.send_result_embed(results, final_str)
+        self.last_result = final_str
+        
+        self.result_label.configure(text=f"🎉 Winner: {final_str} 🎉", text_color="#fdcb6e")
+        self.spin_btn.configure(state="normal", text="Hold to SPIN!")
         
-        self.app_state.setdefault("history", []).insert(0, {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "player": self.player_var.get(), "result": final_str})
+        entry = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "player": self.player_var.get(), "result": final_str, "results": [r[2] for r in results]}
+        if self.pending_replay:
+            entry.update({"seed": self.session_seed, "spin": self.spin_index, "replay": self.pending_replay})
+            self.pending_replay = None
+        self.profile_manager.record_spin(entry)
         
         played_custom = False
         for r in results:
@@ -622,16 +783,18 @@ class WheelOfLuckApp(ctk.CTk):
                 played_custom = True
                 
         if not played_custom:
-            threading.Thread(target=self.audio_manager.play_win_sound, daemon=True).start()
+            self.audio_manager.play_win_sound()
             
-        self.audio_manager.announce_winner(f"The winner is {final_str}!")
+        self.audio_manager.announce_winner([r[2] for r in results])
             
-        self.renderer.spawn_particles(self.app_state.get("particle_style", "Confetti"), self.app_state.get("theme", "Default"))
+        self.renderer.spawn_particles(self.app_state.get("particle_style", "Confetti"), self.app_state.get("theme", "Default"), seed=[self.session_seed, self.spin_index])
+        self.scheduler.start("particles", self.tick_particles)
         
         if self.app_state.get("elimination_mode", False):
             for r in reversed(results):
                 w_idx, opt_idx, _, _, _, _ = r
                 self.app_state["wheels"][w_idx]["options"].pop(opt_idx)
+                self.slice_tables.invalidate(w_idx)
             self.draw_wheel()
             
         trigger_sub_wheels = []
@@ -645,25 +808,29 @@ class WheelOfLuckApp(ctk.CTk):
                 
         if trigger_sub_wheels:
             target = trigger_sub_wheels[0]
+            self.sub_wheel_pending = True
             def trigger():
+                self.sub_wheel_pending = False
                 self.switch_wheel_tab(target)
                 self.on_spin_press(None)
                 self.after(500, self.on_spin_release, None)
             self.after(2500, trigger)
         else:
             self.after(5000, lambda: self.audio_manager.set_bg_volume(0.3))
+        # Also runs after a manual spin, so chat spins that queued up behind it get their turn
+        self.after(SPIN_QUEUE_GAP_MS, self.finish_queued_spin)
             
         self.profile_manager.save_current_profile()
 
-    def particle_worker(self):
-        while self.particle_thread_running:
-            if not self.spinning and self.last_result:
-                if self.renderer.update_particles():
-                    pass # it animated
-            time.sleep(0.016) # ~60fps
+    def tick_particles(self, dt, now):
+        alive = self.renderer.step_particles()
+        self.scheduler.request_redraw("particles")
+        return alive
 
     def on_close(self):
-        self.particle_thread_running = False
+        self.scheduler.cancel()
+        self.twitch_client.stop()
+        self.profile_manager.close()
         self.destroy()
 
 if __name__ == "__main__":
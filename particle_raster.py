@@ -0,0 +1,159 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageTk
+from particles import CONFETTI, MONEY, FIREWORK_SHELL, FIREWORK_SPARK, SHAPE_CIRCLE
+from wheel_sprite import load_font
+
+MONEY_OUTLINE = np.array([0x1e, 0x84, 0x49, 255], dtype=np.uint8).view(np.uint32)[0]
+MONEY_TEXT = np.array([255, 255, 255, 255], dtype=np.uint8).view(np.uint32)[0]
+BLIT_CHUNK_PIXELS = 1 << 20
+
+def hex_to_rgba(color):
+    color = color.lstrip("#")
+    if len(color) == 3:
+        color = "".join(ch * 2 for ch in color)
+    return (int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16), 255)
+
+class ParticleRaster:
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.buffer = None
+        self.pixels = None
+        self.image = None
+        self.photo = None
+        self.item = None
+        self.rgba = np.zeros(0, dtype=np.uint32)
+        self.stamps = {}
+
+    def resize(self, w, h):
+        w, h = max(1, int(w)), max(1, int(h))
+        if (w, h) == (self.width, self.height): return
+        self.width, self.height = w, h
+        self.buffer = np.zeros((h, w, 4), dtype=np.uint8)
+        # Packed RGBA view so each pixel is written with a single flat index
+        self.pixels = self.buffer.view(np.uint32).reshape(-1)
+        # The PIL image shares memory with the buffer, so filling the array is enough to redraw it
+        self.image = Image.frombuffer("RGBA", (w, h), self.buffer, "raw", "RGBA", 0, 1)
+        self.photo = None
+
+    def stamp(self, shape, size):
+        key = (shape, size)
+        offsets = self.stamps.get(key)
+        if offsets is None:
+            if shape == "disc":
+                r = size
+                dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+                mask = dx * dx + dy * dy <= r * r
+            elif shape == "oval":
+                # Filled circle inside the size x size box, like create_oval(x, y, x+size, y+size)
+                c = (size - 1) / 2
+                dy, dx = np.mgrid[0:size, 0:size]
+                mask = (dx - c) ** 2 + (dy - c) ** 2 <= (size / 2) ** 2
+            elif shape == "square":
+                dy, dx = np.mgrid[0:size, 0:size]
+                mask = np.ones_like(dx, dtype=bool)
+            elif shape == "bill":
+                dy, dx = np.mgrid[0:size + 1, 0:size * 2 + 1]
+                mask = (dy == 0) | (dy == size) | (dx == 0) | (dx == size * 2)
+            elif shape == "bill_fill":
+                dy, dx = np.mgrid[1:size, 1:size * 2]
+                mask = np.ones_like(dx, dtype=bool)
+            else:
+                glyph = Image.new("L", (size * 2 + 1, size + 1), 0)
+                ImageDraw.Draw(glyph).text((size, size / 2), "$", font=load_font(max(1, int(size * 0.6 * 4 / 3))), fill=255, anchor="mm")
+                mask = np.asarray(glyph) > 127
+                dy, dx = np.nonzero(mask)
+                offsets = (dy.astype(np.int64), dx.astype(np.int64))
+            if offsets is None:
+                offsets = (dy[mask].astype(np.int64), dx[mask].astype(np.int64))
+            self.stamps[key] = offsets
+        return offsets
+
+    def blit(self, xs, ys, offsets, colors):
+        dy, dx = offsets
+        if not xs.size or not dy.size: return
+        w, h = self.width, self.height
+        x0, x1 = xs + dx.min(), xs + dx.max()
+        y0, y1 = ys + dy.min(), ys + dy.max()
+        visible = (x1 >= 0) & (x0 < w) & (y1 >= 0) & (y0 < h)
+        whole = visible & (x0 >= 0) & (x1 < w) & (y0 >= 0) & (y1 < h)
+        flat = dy * w + dx
+
+        # Fully visible particles need no per-pixel clipping
+        sel = np.flatnonzero(whole)
+        chunk = max(1, BLIT_CHUNK_PIXELS // dy.size)
+        for lo in range(0, sel.size, chunk):
+            part = sel[lo:lo + chunk]
+            idx = (ys[part] * w + xs[part])[:, None] + flat[None, :]
+            self.pixels[idx] = colors if np.ndim(colors) == 0 else colors[part][:, None]
+
+        sel = np.flatnonzero(visible & ~whole)
+        if sel.size:
+            py = ys[sel][:, None] + dy[None, :]
+            px = xs[sel][:, None] + dx[None, :]
+            inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+            fill = colors if np.ndim(colors) == 0 else np.broadcast_to(colors[sel][:, None], py.shape)[inside]
+            self.pixels[(py * w + px)[inside]] = fill
+
+    def blit_groups(self, shape, sizes, xs, ys, colors):
+        for size in np.unique(sizes).tolist():
+            sel = sizes == size
+            self.blit(xs[sel], ys[sel], self.stamp(shape, size), colors[sel])
+
+    def render(self, system, w, h):
+        self.resize(w, h)
+        self.buffer.fill(0)
+        n = system.count
+        if not n: return self.image
+
+        if len(self.rgba) != len(system.palette):
+            self.rgba = np.array([hex_to_rgba(c) for c in system.palette], dtype=np.uint8).view(np.uint32).reshape(-1)
+        kind = system.kind[:n]
+        xs = system.x[:n].astype(np.int64)
+        ys = system.y[:n].astype(np.int64)
+        sizes = system.size[:n].astype(np.int64)
+        colors = self.rgba[system.color[:n]]
+
+        sel = kind == CONFETTI
+        if sel.any():
+            circle = sel & (system.shape[:n] == SHAPE_CIRCLE)
+            square = sel & ~circle
+            self.blit_groups("oval", sizes[circle], xs[circle], ys[circle], colors[circle])
+            self.blit_groups("square", sizes[square], xs[square], ys[square], colors[square])
+
+        sel = kind == MONEY
+        if sel.any():
+            self.blit_groups("bill_fill", sizes[sel], xs[sel], ys[sel], colors[sel])
+            for size in np.unique(sizes[sel]).tolist():
+                grp = sel & (sizes == size)
+                self.blit(xs[grp], ys[grp], self.stamp("bill", size), MONEY_OUTLINE)
+                self.blit(xs[grp], ys[grp], self.stamp("glyph", size), MONEY_TEXT)
+
+        sel = kind == FIREWORK_SHELL
+        if sel.any():
+            self.blit(xs[sel], ys[sel], self.stamp("disc", 4), colors[sel])
+
+        sel = kind == FIREWORK_SPARK
+        if sel.any():
+            radii = np.maximum(1, np.rint(system.size[:n][sel] * system.life[:n][sel])).astype(np.int64)
+            self.blit_groups("disc", radii, xs[sel], ys[sel], colors[sel])
+
+        return self.image
+
+    def draw(self, canvas, system, w, h):
+        self.render(system, w, h)
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(self.image)
+            if self.item is not None:
+                canvas.itemconfigure(self.item, image=self.photo)
+        else:
+            # Reuses the Tk image in place instead of creating a new one every frame
+            self.photo.paste(self.image)
+        if self.item is None:
+            self.item = canvas.create_image(0, 0, image=self.photo, anchor="nw", tags="particle_layer")
+            canvas.tag_raise("particle_layer")
+
+    def detach(self, canvas):
+        if self.item is not None:
+            canvas.delete(self.item)
+            self.item = None
@@ -0,0 +1,161 @@
+import numpy as np
+
+CONFETTI = 0
+MONEY = 1
+FIREWORK_SHELL = 2
+FIREWORK_SPARK = 3
+
+SHAPE_CIRCLE = 0
+SHAPE_SQUARE = 1
+
+# Per-type gravity, indexed by particle type
+GRAVITY = np.array([0.1, 0.05, 0.0, 0.2])
+SPARKS_PER_SHELL = 40
+SPARK_FADE = 0.02
+MONEY_COLOR = "#27ae60"
+
+FLOAT_FIELDS = ("x", "y", "vx", "vy", "life", "size", "target_y")
+INT_FIELDS = ("color", "kind", "shape")
+
+class ParticleSystem:
+    def __init__(self, capacity=1024, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self.capacity = 0
+        self.palette = []
+        self.palette_ids = {}
+        for name in FLOAT_FIELDS:
+            setattr(self, name, np.zeros(0, dtype=np.float64))
+        for name in INT_FIELDS:
+            setattr(self, name, np.zeros(0, dtype=np.int32))
+        self.reserve(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def reserve(self, capacity):
+        if capacity <= self.capacity: return
+        new_capacity = max(capacity, self.capacity * 2)
+        for name in FLOAT_FIELDS + INT_FIELDS:
+            old = getattr(self, name)
+            arr = np.zeros(new_capacity, dtype=old.dtype)
+            arr[:self.count] = old[:self.count]
+            setattr(self, name, arr)
+        self.capacity = new_capacity
+
+    def clear(self):
+        self.count = 0
+
+    def reseed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def color_id(self, color):
+        cid = self.palette_ids.get(color)
+        if cid is None:
+            cid = len(self.palette)
+            self.palette.append(color)
+            self.palette_ids[color] = cid
+        return cid
+
+    def add(self, kind, x, y, vx, vy, size, color, shape=SHAPE_CIRCLE, life=1.0, target_y=0.0):
+        x = np.asarray(x, dtype=np.float64)
+        n = x.size
+        if not n: return
+        lo = self.count
+        hi = lo + n
+        self.reserve(hi)
+        self.x[lo:hi] = x
+        self.y[lo:hi] = y
+        self.vx[lo:hi] = vx
+        self.vy[lo:hi] = vy
+        self.size[lo:hi] = size
+        self.color[lo:hi] = color
+        self.kind[lo:hi] = kind
+        self.shape[lo:hi] = shape
+        self.life[lo:hi] = life
+        self.target_y[lo:hi] = target_y
+        self.count = hi
+
+    def spawn(self, style, colors, w, h, count=150):
+        rng = self.rng
+        w, h = int(w), int(h)
+        color_ids = np.array([self.color_id(c) for c in colors], dtype=np.int32)
+        if style == "Confetti":
+            self.add(
+                CONFETTI,
+                rng.integers(0, w + 1, count), rng.integers(-100, 1, count),
+                rng.uniform(-2, 2, count), rng.uniform(3, 8, count),
+                rng.integers(6, 13, count), color_ids[rng.integers(0, len(color_ids), count)],
+                shape=rng.integers(0, 2, count)
+            )
+        elif style == "Falling Money":
+            count = min(count, 40)
+            self.add(
+                MONEY,
+                rng.integers(0, w + 1, count), rng.integers(-100, 1, count),
+                rng.uniform(-1, 1, count), rng.uniform(8, 15, count),
+                rng.integers(15, 31, count), self.color_id(MONEY_COLOR),
+                shape=SHAPE_SQUARE
+            )
+        elif style == "Fireworks":
+            self.add(
+                FIREWORK_SHELL,
+                rng.integers(int(w*0.2), int(w*0.8) + 1, count), np.full(count, float(h)),
+                rng.uniform(-2, 2, count), rng.uniform(-15, -10, count),
+                8, color_ids[rng.integers(0, len(color_ids), count)],
+                target_y=rng.integers(int(h*0.1), int(h*0.5) + 1, count)
+            )
+
+    def spawn_explosions(self, x, y, color):
+        rng = self.rng
+        n = x.size * SPARKS_PER_SHELL
+        angle = rng.uniform(0, 2*np.pi, n)
+        speed = rng.uniform(3, 10, n)
+        self.add(
+            FIREWORK_SPARK,
+            np.repeat(x, SPARKS_PER_SHELL), np.repeat(y, SPARKS_PER_SHELL),
+            np.cos(angle) * speed, np.sin(angle) * speed,
+            rng.integers(4, 9, n), np.repeat(color, SPARKS_PER_SHELL),
+            life=1.0
+        )
+
+    def step(self, h):
+        if not self.count: return False
+        shells = self.advance(0, h)
+        if shells is not None:
+            # Sparks get their first step in the frame their shell bursts
+            start = self.count
+            self.spawn_explosions(*shells)
+            self.advance(start, h)
+        return self.count > 0
+
+    def advance(self, lo, h):
+        hi = self.count
+        if hi <= lo: return None
+        x, y = self.x[lo:hi], self.y[lo:hi]
+        vx, vy = self.vx[lo:hi], self.vy[lo:hi]
+        life, kind = self.life[lo:hi], self.kind[lo:hi]
+
+        x += vx
+        y += vy
+        vy += GRAVITY[kind]
+        is_spark = kind == FIREWORK_SPARK
+        life[is_spark] -= SPARK_FADE
+
+        is_shell = kind == FIREWORK_SHELL
+        burst = is_shell & ((vy >= 0) | (y <= self.target_y[lo:hi]))
+        alive = np.where(is_shell, ~burst & (y > 0), y < h)
+        alive &= ~is_spark | (life > 0)
+
+        shells = None
+        if burst.any():
+            shells = (x[burst].copy(), y[burst].copy(), self.color[lo:hi][burst].copy())
+
+        keep = np.flatnonzero(alive)
+        if keep.size != hi - lo:
+            m = lo + keep.size
+            for name in FLOAT_FIELDS + INT_FIELDS:
+                arr = getattr(self, name)
+                arr[lo:m] = arr[lo:hi][keep]
+            self.count = m
+        return shells
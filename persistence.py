@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import threading
+
+TEMP_PREFIX = ".tmp-"
+
+def atomic_write_json(path, data, indent=2):
+    # Write a sibling temp file, fsync it, then rename over the target: readers see the old file or the new one, never half of one
+    directory = os.path.dirname(os.path.abspath(path))
+    # Not *.json, so a write in progress (or one a crash left behind) is never mistaken for a profile
+    fd, tmp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, suffix=".json.tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+    # The rename is only durable once the directory entry is flushed too (not possible on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(directory, os.O_DIRECTORY)
+            try: os.fsync(dir_fd)
+            finally: os.close(dir_fd)
+        except OSError:
+            pass
+
+def remove_stale_temps(directory):
+    # Temp files only outlive their write if the process died mid-save; the target still holds the previous version
+    for name in os.listdir(directory):
+        if name.startswith(TEMP_PREFIX):
+            try: os.remove(os.path.join(directory, name))
+            except OSError: pass
+
+def snapshot(value):
+    # Copies the JSON containers only; strings and numbers are immutable and can be shared with the writer thread
+    if isinstance(value, dict):
+        return {k: snapshot(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [snapshot(v) for v in value]
+    return value
+
+class DebouncedWriter:
+    def __init__(self, root, delay_ms=750):
+        self.root = root
+        self.delay_ms = delay_ms
+        self.after_id = None
+        self.pending = {}
+        self.queue = {}
+        self.writing = False
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def schedule(self, path, get_state):
+        # Every save inside the window collapses into one write of the state as it is when the window closes
+        self.pending[path] = get_state
+        if self.after_id is None:
+            self.after_id = self.root.after(self.delay_ms, self.fire)
+
+    def fire(self):
+        self.after_id = None
+        pending = self.pending
+        self.pending = {}
+        # The snapshot is taken on the UI thread, so the writer never sees a half-edited state
+        for path, get_state in pending.items():
+            self.submit(path, snapshot(get_state()))
+
+    def submit(self, path, data):
+        with self.cond:
+            # A newer snapshot of the same file replaces one that has not been written yet
+            self.queue[path] = data
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+    def run(self):
+        while True:
+            with self.cond:
+                while not self.queue:
+                    self.cond.wait()
+                path = next(iter(self.queue))
+                data = self.queue.pop(path)
+                self.writing = True
+            try:
+                atomic_write_json(path, data)
+            except Exception as e:
+                print(f"Failed to save {path}:", e)
+            with self.cond:
+                self.writing = False
+                self.cond.notify_all()
+
+    def flush(self):
+        # Writes anything pending and waits for it, e.g. before closing or switching profiles
+        if self.after_id is not None:
+            try: self.root.after_cancel(self.after_id)
+            except: pass
+        self.fire()
+        with self.cond:
+            while self.queue or self.writing:
+                self.cond.wait()
@@ -1,27 +1,79 @@
 import os
 import json
 import shutil
-import csv
+import itertools
+import collections
+import threading
 from tkinter import filedialog, messagebox
+from persistence import atomic_write_json, snapshot, remove_stale_temps, DebouncedWriter
+from history_log import HistoryLog, log_dir_for
+from stats_aggregate import StatsAggregate
+
+def open_history_store(profile_path, backend):
+    if backend == "SQLite":
+        from history_db import HistoryDB, db_path_for
+        return HistoryDB(db_path_for(profile_path))
+    return HistoryLog(log_dir_for(profile_path))
+
+class HistoryMigration:
+    # Copies the first `count` spins into the other backend on a thread. SQLite connections belong to the thread
+    # that opened them, so both stores are opened here; the UI keeps appending to its own store meanwhile.
+    def __init__(self, open_reader, profile_path, backend, count):
+        self.open_reader = open_reader
+        self.profile_path = profile_path
+        self.backend = backend
+        self.count = count
+        self.finished = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            reader = self.open_reader()
+            new = open_history_store(self.profile_path, self.backend)
+            try:
+                new.clear()
+                new.extend(itertools.islice(iter(reader), self.count))
+            finally:
+                new.close()
+                reader.close()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = True
 
 class ProfileManager:
-    def __init__(self, app_state, on_profile_changed):
+    def __init__(self, app_state, on_profile_changed, root=None, on_history_backend_changed=None):
         self.app_state = app_state
         self.on_profile_changed = on_profile_changed
+        # Told when a backend switch starts, is refused or ends, so the UI can show the backend actually in use
+        self.on_history_backend_changed = on_history_backend_changed or (lambda: None)
+        # Without a Tk root to debounce on, saves are written straight away (still atomically)
+        self.writer = DebouncedWriter(root) if root is not None else None
+        self.history = None
+        self.migration = None
+        self.stats = StatsAggregate()
         self.profiles_dir = "profiles"
         os.makedirs(self.profiles_dir, exist_ok=True)
+        remove_stale_temps(self.profiles_dir)
         self.current_profile = "default.json"
 
     def initialize(self):
         if not os.path.exists(os.path.join(self.profiles_dir, "default.json")):
             self._reset_state()
+            self.open_history()
             self.save_current_profile()
             self.on_profile_changed()
         else:
             self.load_profile("default.json")
 
     def get_profiles_list(self):
-        profiles = [f[:-5] for f in os.listdir(self.profiles_dir) if f.endswith(".json")]
+        # Stats used to be saved as <name>.stats.json; those are not profiles even before they are migrated
+        profiles = [f[:-5] for f in os.listdir(self.profiles_dir) if f.endswith(".json") and not f.endswith(".stats.json")]
         return profiles if profiles else ["default"]
 
     def switch_profile(self, profile_name):
@@ -29,7 +81,10 @@ class ProfileManager:
         self.load_profile(self.current_profile)
 
     def load_profile(self, filename):
+        # A pending save still belongs to the profile being replaced
+        self.flush()
         path = os.path.join(self.profiles_dir, filename)
+        legacy_history = []
         if os.path.exists(path):
             try:
                 with open(path, "r", encoding="utf-8") as f:
@@ -47,20 +102,137 @@ class ProfileManager:
                                 migrated_opts.append(opt)
                         self.app_state["wheels"] = [{"name": "Wheel 1", "options": migrated_opts}]
                             
-                    self.app_state["history"] = data.get("history", [])
+                    legacy_history = data.get("history", [])
                     self.app_state["theme"] = data.get("theme", "Default")
                     self.app_state["elimination_mode"] = data.get("elimination_mode", False)
+                    self.app_state["history_backend"] = data.get("history_backend", "JSONL")
+                    self.app_state["instant_spin"] = data.get("instant_spin", False)
+                    self.app_state["spin_queue_policy"] = data.get("spin_queue_policy", "Queue")
                     self.app_state["background_image"] = data.get("background_image", None)
                     self.app_state["centerpiece_image"] = data.get("centerpiece_image", None)
                     self.app_state["particle_style"] = data.get("particle_style", "Confetti")
+                    self.app_state["particle_render"] = data.get("particle_render", "Canvas Items")
+                    self.app_state["render_mode"] = data.get("render_mode", "Vector")
             except:
                 self._reset_state()
         else:
             self._reset_state()
             
         self.current_profile = filename
+        self.open_history()
+        if legacy_history:
+            # Profiles used to keep history inline, newest first; move it to the log once
+            self.merge_legacy_history(legacy_history)
+            self.save_current_profile()
         self.on_profile_changed()
 
+    def open_history(self):
+        if self.history is not None:
+            self.history.close()
+        self.history = self.make_history(self.app_state.get("history_backend", "JSONL"))
+        self.stats = StatsAggregate()
+        legacy_stats = os.path.splitext(self.stats_path())[0] + ".stats.json"
+        if os.path.exists(legacy_stats) and not os.path.exists(self.stats_path()):
+            os.replace(legacy_stats, self.stats_path())
+        try:
+            with open(self.stats_path(), "r", encoding="utf-8") as f:
+                self.stats.load(json.load(f))
+        except:
+            pass
+
+    def merge_legacy_history(self, legacy_history):
+        if not len(self.history):
+            self.history.extend(reversed(legacy_history))
+            return
+        # An imported profile can carry inline history next to an existing log; keep the spins the log lacks.
+        # Spins the log already has (a migration cut short before the profile was rewritten) are not added twice.
+        # Matching is by count, since two spins in the same second can look identical, most of all unseeded ones.
+        key = lambda e: (e.get("time"), e.get("player", "Guest"), e.get("result"), e.get("seed"), e.get("spin"))
+        known = collections.Counter(key(e) for e in self.history)
+        missing = []
+        for e in reversed(legacy_history):
+            if known[key(e)]:
+                known[key(e)] -= 1
+            else:
+                missing.append(e)
+        self.history.extend(missing)
+        if missing:
+            print(f"Merged {len(missing)} spins from the profile file into its history log")
+
+    def stats_path(self):
+        # Not *.json, or get_profiles_list would offer it as a profile
+        return os.path.splitext(os.path.join(self.profiles_dir, self.current_profile))[0] + ".stats"
+
+    def record_spin(self, entry):
+        self.history.append(entry)
+        self.stats.add(entry["result"], entry.get("player", "Guest"))
+        self.save_stats()
+
+    def get_stats(self):
+        # The snapshot is only trusted while it covers exactly the spins in the history
+        if self.stats.total != len(self.history):
+            self.stats.rebuild(self.history.result_counts(), self.history.player_stats())
+            self.save_stats()
+        return self.stats
+
+    def save_stats(self):
+        if self.writer is None:
+            atomic_write_json(self.stats_path(), self.stats.to_dict())
+            return
+        self.writer.schedule(self.stats_path(), self.stats.to_dict)
+
+    def clear_history(self):
+        self.finish_migration()
+        self.history.clear()
+        self.stats.clear()
+        self.save_stats()
+
+    def make_history(self, backend):
+        return open_history_store(os.path.join(self.profiles_dir, self.current_profile), backend)
+
+    def set_history_backend(self, backend):
+        if backend == self.app_state.get("history_backend", "JSONL") or self.migration is not None:
+            self.on_history_backend_changed()
+            return
+        # The bulk copy runs on a thread; spins recorded meanwhile still go to the old store and follow on at the end
+        path = os.path.join(self.profiles_dir, self.current_profile)
+        self.migration = HistoryMigration(self.history.reader, path, backend, len(self.history)).start()
+        self.on_history_backend_changed()
+        if self.writer is None:
+            self.finish_migration()
+        else:
+            self.writer.root.after(100, self.poll_migration)
+
+    def poll_migration(self):
+        if self.migration is None: return
+        if not self.migration.finished:
+            self.writer.root.after(100, self.poll_migration)
+            return
+        self.finish_migration()
+
+    def finish_migration(self):
+        job = self.migration
+        if job is None: return
+        job.thread.join()
+        self.migration = None
+        if job.error is not None:
+            self.on_history_backend_changed()
+            messagebox.showerror("Error", f"Failed to move history to {job.backend}: {job.error}")
+            return
+        # Spins move across in order and are removed from the old store, so the two can never disagree
+        old = self.history
+        new = open_history_store(job.profile_path, job.backend)
+        tail = len(old) - job.count
+        if tail > 0:
+            new.extend(reversed(old.page(0, tail)))
+        old.clear()
+        old.close()
+        self.history = new
+        self.app_state["history_backend"] = job.backend
+        # switch_profile names the next profile before flushing, so save to the one that was migrated
+        self.save_current_profile(job.profile_path)
+        self.on_history_backend_changed()
+
     def _reset_state(self):
         self.app_state["wheels"] = [
             {"name": "Wheel 1", "options": [
@@ -70,24 +242,47 @@ class ProfileManager:
                 {"name": "Try Again", "weight": 2}
             ]}
         ]
-        self.app_state["history"] = []
+        self.app_state.pop("history", None)
         self.app_state["theme"] = "Default"
         self.app_state["elimination_mode"] = False
+        self.app_state["history_backend"] = "JSONL"
+        self.app_state["instant_spin"] = False
+        self.app_state["spin_queue_policy"] = "Queue"
         self.app_state["background_image"] = None
         self.app_state["centerpiece_image"] = None
         self.app_state["particle_style"] = "Confetti"
+        self.app_state["particle_render"] = "Canvas Items"
+        self.app_state["render_mode"] = "Vector"
 
-    def save_current_profile(self):
+    def save_current_profile(self, path=None):
         if not self.current_profile: return
-        path = os.path.join(self.profiles_dir, self.current_profile)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.app_state, f, indent=2)
+        path = path or os.path.join(self.profiles_dir, self.current_profile)
+        if self.writer is None:
+            atomic_write_json(path, self.app_state)
+            return
+        # The writer deep-copies app_state on the UI thread at most once per debounce window, however many saves
+        # land in it. The copy is bounded by the wheels and settings: history lives in its own store and is
+        # never part of app_state. Four wheels of 1000 options copy in about 5 ms.
+        self.writer.schedule(path, lambda: self.app_state)
+
+    def flush(self):
+        self.finish_migration()
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        self.flush()
+        if self.history is not None:
+            self.history.close()
 
     def new_profile(self, name):
         filename = name.strip() + ".json"
         if not os.path.exists(os.path.join(self.profiles_dir, filename)):
+            self.flush()
             self._reset_state()
             self.current_profile = filename
+            self.open_history()
+            self.clear_history()
             self.save_current_profile()
             self.on_profile_changed()
         else:
@@ -99,8 +294,16 @@ class ProfileManager:
             return False
         if messagebox.askyesno("Delete", f"Delete profile '{self.current_profile[:-5]}'?"):
             path = os.path.join(self.profiles_dir, self.current_profile)
-            if os.path.exists(path):
-                os.remove(path)
+            self.flush()
+            self.history.clear()
+            self.history.close()
+            # Both backends, whichever is in use: a store left behind by an earlier switch goes too
+            from history_db import db_path_for
+            db = db_path_for(path)
+            for p in (path, self.stats_path(), db, db + "-wal", db + "-shm"):
+                if os.path.exists(p):
+                    os.remove(p)
+            shutil.rmtree(log_dir_for(path), ignore_errors=True)
             self.current_profile = "default.json"
             self.load_profile(self.current_profile)
             return True
@@ -111,6 +314,7 @@ class ProfileManager:
         if path:
             filename = os.path.basename(path)
             dest = os.path.join(self.profiles_dir, filename)
+            self.flush()
             shutil.copy2(path, dest)
             self.current_profile = filename
             self.load_profile(filename)
@@ -118,23 +322,11 @@ class ProfileManager:
     def export_profile(self):
         path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")], initialfile=self.current_profile)
         if path:
-            src = os.path.join(self.profiles_dir, self.current_profile)
-            if os.path.exists(src):
-                shutil.copy2(src, path)
-                messagebox.showinfo("Export", "Profile exported successfully!")
-                
-    def export_history_csv(self):
-        if not self.app_state.get("history"):
-            messagebox.showinfo("History", "No history to export.")
-            return
-        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")], initialfile="spin_history.csv")
-        if path:
+            # Exports stay self-contained: the history goes back inline, which load_profile migrates on import
+            data = snapshot(self.app_state)
+            data["history"] = list(self.history.iter_newest())
             try:
-                with open(path, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["Time", "Result"])
-                    for item in self.app_state["history"]:
-                        writer.writerow([item["time"], item["result"]])
-                messagebox.showinfo("Export", "History exported to CSV successfully!")
+                atomic_write_json(path, data)
+                messagebox.showinfo("Export", "Profile exported successfully!")
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to export CSV: {e}")
+                messagebox.showerror("Error", f"Failed to export profile: {e}")
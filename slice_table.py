@@ -0,0 +1,48 @@
+import bisect
+import itertools
+
+POINTER_ANGLE = 90
+
+_versions = itertools.count(1)
+
+class SliceTable:
+    def __init__(self, options):
+        self.version = next(_versions)
+        self.size = len(options)
+        self.starts = []
+        self.ends = []
+        self.extents = []
+        self.total_weight = sum(opt.get("weight", 1) for opt in options)
+        if self.total_weight <= 0: return
+
+        current_angle_sum = 0
+        for opt in options:
+            angle_extent = (opt.get("weight", 1) / self.total_weight) * 360
+            self.starts.append(current_angle_sum)
+            self.extents.append(angle_extent)
+            current_angle_sum += angle_extent
+            self.ends.append(current_angle_sum)
+
+    def index_at(self, angle):
+        # Same half-open [start, end) slices as a linear walk, found by bisecting the prefix sums
+        effective_angle = (POINTER_ANGLE - angle) % 360
+        i = bisect.bisect_right(self.ends, effective_angle)
+        return i if i < len(self.ends) else 0
+
+class SliceTableCache:
+    def __init__(self):
+        self.tables = {}
+
+    def get(self, wheel_idx, options):
+        entry = self.tables.get(wheel_idx)
+        # A replaced or resized options list can never reuse a table, even without an explicit invalidate
+        if entry is None or entry[0] is not options or entry[1].size != len(options):
+            entry = (options, SliceTable(options))
+            self.tables[wheel_idx] = entry
+        return entry[1]
+
+    def invalidate(self, wheel_idx=None):
+        if wheel_idx is None:
+            self.tables.clear()
+        else:
+            self.tables.pop(wheel_idx, None)
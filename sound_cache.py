@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+import pygame
+
+class SoundCache:
+    # Decodes each file once and keeps the decoded PCM under a byte budget, least recently played out first
+    def __init__(self, budget_bytes=64 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.sounds = OrderedDict()
+        self.sizes = {}
+        self.failed = set()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def sound_bytes(self, sound):
+        init = pygame.mixer.get_init()
+        if not init: return 0
+        freq, fmt, channels = init
+        return int(sound.get_length() * freq) * channels * (abs(fmt) // 8)
+
+    def get(self, path):
+        if not path: return None
+        with self.lock:
+            sound = self.sounds.get(path)
+            if sound is not None:
+                self.sounds.move_to_end(path)
+                return sound
+            if path in self.failed: return None
+        try:
+            # Decoding happens outside the lock so a slow file never stalls ticks from cached sounds
+            sound = pygame.mixer.Sound(path)
+        except Exception as e:
+            print(f"Could not load sound {path}:", e)
+            with self.lock:
+                self.failed.add(path)
+            return None
+        return self.put(path, sound)
+
+    def cached(self, key):
+        # Lookup only, for derived sounds such as pitched ticks that have no file to decode from
+        with self.lock:
+            sound = self.sounds.get(key)
+            if sound is not None:
+                self.sounds.move_to_end(key)
+            return sound
+
+    def put(self, path, sound):
+        size = self.sound_bytes(sound)
+        with self.lock:
+            if path in self.sounds:
+                return self.sounds[path]
+            self.sounds[path] = sound
+            self.sizes[path] = size
+            self.total_bytes += size
+            while self.total_bytes > self.budget_bytes and len(self.sounds) > 1:
+                old, _ = self.sounds.popitem(last=False)
+                self.total_bytes -= self.sizes.pop(old)
+        return sound
+
+    def preload(self, paths):
+        with self.lock:
+            # Files may have been fixed or replaced since they last failed
+            self.failed.clear()
+        for path in paths:
+            self.get(path)
+
+    def clear(self):
+        with self.lock:
+            self.sounds.clear()
+            self.sizes.clear()
+            self.failed.clear()
+            self.total_bytes = 0
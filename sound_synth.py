@@ -0,0 +1,75 @@
+import threading
+import numpy as np
+import pygame
+
+DEFAULT_RATE = 44100
+TICK_FREQ = 1800.0
+TICK_SECONDS = 0.03
+# The old winsound fanfare: (frequency, seconds)
+FANFARE_NOTES = ((1000.0, 0.2), (1200.0, 0.2), (1500.0, 0.4))
+
+_cache = {}
+_lock = threading.Lock()
+
+def mixer_format():
+    init = pygame.mixer.get_init()
+    return init if init else (DEFAULT_RATE, -16, 2)
+
+def tick_wave(rate, pitch=1.0):
+    # A short decaying sine with a noise transient, so it reads as a click rather than a beep
+    n = max(1, int(rate * TICK_SECONDS))
+    t = np.arange(n) / rate
+    env = np.exp(-t * 180.0)
+    tone = np.sin(2 * np.pi * TICK_FREQ * pitch * t)
+    noise = np.random.default_rng(0).uniform(-1, 1, n) * np.exp(-t * 900.0)
+    return 0.6 * env * tone + 0.3 * noise
+
+def fanfare_wave(rate, pitch=1.0):
+    notes = []
+    for freq, seconds in FANFARE_NOTES:
+        n = int(rate * seconds)
+        t = np.arange(n) / rate
+        # Fundamental plus two softer harmonics, with short attack and release ramps so notes do not click
+        f = freq * pitch
+        wave = np.sin(2 * np.pi * f * t) + 0.35 * np.sin(4 * np.pi * f * t) + 0.15 * np.sin(6 * np.pi * f * t)
+        ramp = min(n // 2, int(rate * 0.01))
+        env = np.ones(n)
+        env[:ramp] = np.linspace(0, 1, ramp)
+        env[n - ramp:] = np.linspace(1, 0, ramp)
+        notes.append(0.4 * wave * env * np.exp(-t * 2.0))
+    return np.concatenate(notes)
+
+WAVES = {"tick": tick_wave, "fanfare": fanfare_wave}
+
+def to_pcm(wave, fmt, channels):
+    # Float samples in [-1, 1] to the mixer's own sample format and channel layout
+    wave = np.clip(wave, -1.0, 1.0)
+    bits = abs(fmt)
+    if bits == 32:
+        pcm = wave.astype(np.float32)
+    elif bits == 8:
+        pcm = (wave * 127).astype(np.int8) if fmt < 0 else (wave * 127 + 128).astype(np.uint8)
+    else:
+        pcm = (wave * 32767).astype(np.int16) if fmt < 0 else (wave * 32767 + 32768).astype(np.uint16)
+    if channels > 1:
+        pcm = np.repeat(pcm[:, None], channels, axis=1)
+    return np.ascontiguousarray(pcm)
+
+def synth_sound(kind, pitch=1.0):
+    # Built once per (kind, pitch, mixer format) and reused for every play; nothing touches the disk
+    rate, fmt, channels = mixer_format()
+    key = (kind, round(pitch, 3), rate, fmt, channels)
+    with _lock:
+        sound = _cache.get(key)
+    if sound is not None: return sound
+    pcm = to_pcm(WAVES[kind](rate, pitch), fmt, channels)
+    try:
+        sound = pygame.sndarray.make_sound(pcm)
+    except Exception:
+        sound = pygame.mixer.Sound(buffer=pcm.tobytes())
+    with _lock:
+        return _cache.setdefault(key, sound)
+
+def clear():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,165 @@
+import numpy as np
+from slice_table import POINTER_ANGLE
+
+STEP = 1 / 60
+BASE_FRICTION = 2.0
+PEG_RESISTANCE = 1.0
+FLAPPER_DECAY = 5.0
+# Catch-up limit per advance; time past it is dropped, so a stalled UI slows the spin down in wall-clock time.
+# The outcome still never changes, because it depends only on the number of fixed steps, not on elapsed time.
+MAX_STEPS_PER_ADVANCE = 8
+
+def slice_boundaries(tables):
+    # Rows of slice end angles padded with +inf, one row per wheel
+    width = max([len(t.ends) for t in tables] + [1])
+    ends = np.full((len(tables), width), np.inf)
+    sizes = np.zeros(len(tables), dtype=np.int64)
+    for i, table in enumerate(tables):
+        ends[i, :len(table.ends)] = table.ends
+        sizes[i] = len(table.ends)
+    return ends, sizes
+
+def slices_at(ends, sizes, angles):
+    # Vectorized SliceTable.index_at over the last (wheel) axis; a batch of spins shares each search
+    effective = (POINTER_ANGLE - angles) % 360
+    idx = np.empty(effective.shape, dtype=np.int64)
+    for w in range(ends.shape[0]):
+        idx[..., w] = np.searchsorted(ends[w], effective[..., w], side="right")
+    return np.where(idx < sizes, idx, 0)
+
+def step_kernel(angles, vel, bends, last_slices, ends, sizes, step=STEP):
+    # One fixed step for any batch shape; the animation and the predictor share it so they agree bit for bit
+    scale = step * 60.0
+    moving = vel > 0
+    angles = np.where(moving, (angles + vel * scale) % 360, angles)
+    slices = slices_at(ends, sizes, angles)
+    crossed = moving & (slices != last_slices)
+    last_slices = np.where(crossed, slices, last_slices)
+
+    # Peg resistance and a flapper snap on every slice change
+    vel = np.where(crossed, np.maximum(vel - PEG_RESISTANCE, 0.0), vel)
+    bends = np.where(crossed, 1.0, bends)
+    bends = np.where(moving & (bends > 0), np.maximum(bends - step * FLAPPER_DECAY, 0.0), bends)
+    vel = np.where(moving, np.maximum(vel - BASE_FRICTION * scale, 0.0), vel)
+    return angles, vel, bends, last_slices, crossed
+
+def slice_bounds(ends, size, slices):
+    # [lo, hi) of each slice in pointer coordinates; slice 0 also owns anything at or past the last end
+    padded = np.concatenate(([-np.inf], ends[:size]))
+    lo = padded[slices]
+    hi = ends[slices]
+    wrap = np.where(slices == 0, ends[size - 1] if size else np.inf, np.inf)
+    return lo, hi, wrap
+
+def settle_wheel(angles, vel, ends, size, step=STEP):
+    # Runs a batch of spins of one wheel to rest with the same arithmetic as step_kernel. Each step
+    # is a bounds check against the current slice; the slice search only runs for spins that crossed.
+    scale = step * 60.0
+    angles = angles.copy()
+    vel = vel.copy()
+    effective = (POINTER_ANGLE - angles) % 360
+    last_slices = np.searchsorted(ends, effective, side="right")
+    last_slices[last_slices >= size] = 0
+    lo, hi, wrap = slice_bounds(ends, size, last_slices)
+
+    active = np.flatnonzero(vel > 0)
+    while active.size:
+        a = (angles[active] + vel[active] * scale) % 360
+        v = vel[active]
+        effective = (POINTER_ANGLE - a) % 360
+        crossed = ~(((effective >= lo[active]) & (effective < hi[active])) | (effective >= wrap[active]))
+        if crossed.any():
+            idx = active[crossed]
+            slices = np.searchsorted(ends, effective[crossed], side="right")
+            slices[slices >= size] = 0
+            last_slices[idx] = slices
+            lo[idx], hi[idx], wrap[idx] = slice_bounds(ends, size, slices)
+            v = np.where(crossed, np.maximum(v - PEG_RESISTANCE, 0.0), v)
+        v = np.maximum(v - BASE_FRICTION * scale, 0.0)
+        angles[active] = a
+        vel[active] = v
+        active = active[v > 0]
+    return angles, last_slices
+
+def predict_spins(angles, velocities, tables, step=STEP):
+    # Final angles and winning slices without animating, identical to what SpinPhysics would land on.
+    # Inputs are (..., wheels); wheels never interact, so each wheel's column is settled as one batch.
+    ends, sizes = slice_boundaries(tables)
+    angles, vel = np.broadcast_arrays(np.asarray(angles, dtype=np.float64), np.asarray(velocities, dtype=np.float64))
+    final_angles = np.empty(angles.shape)
+    final_slices = np.zeros(angles.shape, dtype=np.int64)
+    for w in range(len(tables)):
+        if not sizes[w]:
+            final_angles[..., w] = angles[..., w]
+            continue
+        a, s = settle_wheel(angles[..., w].ravel(), vel[..., w].ravel(), ends[w, :sizes[w]], sizes[w], step)
+        final_angles[..., w] = a.reshape(angles.shape[:-1])
+        final_slices[..., w] = s.reshape(angles.shape[:-1])
+    return final_angles, final_slices
+
+class SpinPhysics:
+    def __init__(self, step=STEP):
+        self.step = step
+        self.accumulator = 0.0
+        self.ends = np.full((0, 1), np.inf)
+        self.sizes = np.zeros(0, dtype=np.int64)
+        self.angles = np.zeros(0)
+        self.prev_angles = np.zeros(0)
+        self.velocities = np.zeros(0)
+        self.bends = np.zeros(0)
+        self.prev_bends = np.zeros(0)
+        self.last_slices = np.zeros(0, dtype=np.int64)
+
+    def start(self, angles, velocities, tables):
+        self.ends, self.sizes = slice_boundaries(tables)
+        self.angles = np.array(angles, dtype=np.float64)
+        self.prev_angles = self.angles.copy()
+        self.velocities = np.array(velocities, dtype=np.float64)
+        self.bends = np.zeros(len(self.angles))
+        self.prev_bends = self.bends.copy()
+        self.last_slices = slices_at(self.ends, self.sizes, self.angles)
+        self.accumulator = 0.0
+
+    def is_stopped(self):
+        return not (self.velocities > 0).any()
+
+    def step_once(self):
+        moving = self.velocities > 0
+        self.prev_angles = self.angles
+        self.prev_bends = self.bends
+        if not moving.any():
+            return moving
+
+        self.angles, self.velocities, self.bends, self.last_slices, crossed = step_kernel(
+            self.angles, self.velocities, self.bends, self.last_slices, self.ends, self.sizes, self.step
+        )
+        return crossed
+
+    def advance(self, dt):
+        # Returns how many pegs each wheel crossed during this frame
+        crossings = np.zeros(len(self.angles), dtype=np.int64)
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= self.step and steps < MAX_STEPS_PER_ADVANCE:
+            crossings += self.step_once()
+            self.accumulator -= self.step
+            steps += 1
+        if steps == MAX_STEPS_PER_ADVANCE:
+            self.accumulator = min(self.accumulator, self.step)
+        if self.is_stopped():
+            # Settle on the exact final state rather than an interpolated one
+            self.accumulator = 0.0
+            self.prev_angles = self.angles
+            self.prev_bends = self.bends
+        return crossings
+
+    def alpha(self):
+        return min(1.0, self.accumulator / self.step)
+
+    def render_angles(self):
+        # Interpolated between the last two fixed steps; angles only ever grow, so wrap forwards
+        delta = (self.angles - self.prev_angles) % 360
+        return (self.prev_angles + delta * self.alpha()) % 360
+
+    def render_bends(self):
+        return self.prev_bends + (self.bends - self.prev_bends) * self.alpha()
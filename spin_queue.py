@@ -0,0 +1,145 @@
+import time
+from collections import deque
+
+POLICIES = ["Queue", "Coalesce", "Drop"]
+MAX_DEPTH = 10
+# Chat may start at most BURST spins back to back, then one every 1 / RATE seconds
+RATE = 0.1
+BURST = 3
+USER_COOLDOWN = 60.0
+DEDUPE_WINDOW = 10.0
+# Seen-request tables are pruned past this size, so a raid of thousands of names cannot grow them for good
+PRUNE_AT = 4096
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.last = clock()
+
+    def take(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens < 1: return False
+        self.tokens -= 1
+        return True
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+class SpinRequest:
+    def __init__(self, user, text, at):
+        self.user = user
+        self.text = text
+        self.at = at
+        # Everyone whose request was folded into this spin under the Coalesce policy
+        self.users = [user]
+        # Each user's cooldown before this request, restored if the spin never starts
+        self.previous = {}
+
+class SpinQueue:
+    # Admission control for chat-triggered spins. Lives on the UI thread: the Twitch poll submits requests,
+    # and show_result calls on_spin_finished, which starts the next waiting spin once the wheel is free.
+    def __init__(self, start_spin, is_busy, policy="Queue", max_depth=MAX_DEPTH, rate=RATE, burst=BURST,
+                 user_cooldown=USER_COOLDOWN, dedupe_window=DEDUPE_WINDOW, clock=time.monotonic):
+        self.start_spin = start_spin
+        self.is_busy = is_busy
+        self.policy = policy
+        self.max_depth = max_depth
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.user_cooldown = user_cooldown
+        self.dedupe_window = dedupe_window
+        self.clock = clock
+        self.pending = deque()
+        self.active = False
+        self.last_seen = {}
+        self.last_accepted = {}
+        self.peak_depth = 0
+        self.pruned_at = clock()
+        self.counts = dict.fromkeys(["requested", "started", "queued", "coalesced", "duplicate", "cooldown", "rate", "busy", "full", "failed"], 0)
+
+    def submit(self, user, text="!spin"):
+        # Returns what happened to the request: "started", "queued", "coalesced" or the reason it was dropped
+        now = self.clock()
+        self.counts["requested"] += 1
+        user = user.lower()
+        self.prune(now)
+        key = (user, text.strip().lower())
+        # Only admitted requests open a dedupe window, so retrying after a drop or a finished spin gets through
+        seen = self.last_seen.get(key)
+        if seen is not None and now - seen < self.dedupe_window:
+            return self.count("duplicate")
+        accepted = self.last_accepted.get(user)
+        if accepted is not None and now - accepted < self.user_cooldown:
+            return self.count("cooldown")
+
+        waiting = self.active or self.pending or self.is_busy()
+        if waiting and self.policy == "Drop":
+            return self.count("busy")
+        if waiting and self.policy == "Coalesce" and self.pending:
+            self.pending[-1].users.append(user)
+            self.pending[-1].previous.setdefault(user, accepted)
+            self.last_accepted[user] = now
+            self.last_seen[key] = now
+            return self.count("coalesced")
+        if waiting and len(self.pending) >= (1 if self.policy == "Coalesce" else self.max_depth):
+            return self.count("full")
+        if not self.bucket.take():
+            return self.count("rate")
+
+        self.last_accepted[user] = now
+        self.last_seen[key] = now
+        request = SpinRequest(user, text, now)
+        request.previous[user] = accepted
+        self.pending.append(request)
+        self.peak_depth = max(self.peak_depth, len(self.pending))
+        if waiting:
+            return self.count("queued")
+        self.start_next()
+        return "started" if self.active else "failed"
+
+    def count(self, outcome):
+        self.counts[outcome] += 1
+        return outcome
+
+    def on_spin_finished(self):
+        if self.is_busy(): return
+        self.active = False
+        if self.pending:
+            self.start_next()
+
+    def start_next(self):
+        request = self.pending.popleft()
+        if self.start_spin(request):
+            self.active = True
+            self.counts["started"] += 1
+            return
+        # The wheel could not spin (e.g. an empty wheel); the rest would fail the same way.
+        # None of them cost a spin, so their tokens and cooldowns are handed back.
+        failed = [request] + list(self.pending)
+        self.counts["failed"] += len(failed)
+        self.pending.clear()
+        for request in failed:
+            self.bucket.refund()
+            for user, previous in request.previous.items():
+                if previous is None: self.last_accepted.pop(user, None)
+                else: self.last_accepted[user] = previous
+
+    def prune(self, now):
+        # At most once per dedupe window, so a raid of fresh names never makes this quadratic
+        if now - self.pruned_at < self.dedupe_window: return
+        self.pruned_at = now
+        if len(self.last_seen) > PRUNE_AT:
+            self.last_seen = {k: t for k, t in self.last_seen.items() if now - t < self.dedupe_window}
+        if len(self.last_accepted) > PRUNE_AT:
+            self.last_accepted = {k: t for k, t in self.last_accepted.items() if now - t < self.user_cooldown}
+
+    def clear(self):
+        self.pending.clear()
+        self.active = False
+
+    def metrics(self):
+        return dict(self.counts, depth=len(self.pending), peak_depth=self.peak_depth)
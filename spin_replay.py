@@ -0,0 +1,92 @@
+import argparse
+import hashlib
+import json
+import numpy as np
+from fairness_sim import load_profile_data, load_wheels, profile_path
+from history_log import HistoryLog, log_dir_for
+from history_db import HistoryDB, db_path_for
+from slice_table import SliceTable
+from spin_physics import predict_spins
+
+def options_snapshot(wheel_options):
+    # Only names and weights decide an outcome; images and sounds can change without breaking replays
+    return [[[opt["name"], opt.get("weight", 1)] for opt in options] for options in wheel_options]
+
+def snapshot_hash(snapshot):
+    return hashlib.sha256(json.dumps(snapshot, separators=(",", ":")).encode("utf-8")).hexdigest()[:16]
+
+def options_hash(wheel_options):
+    return snapshot_hash(options_snapshot(wheel_options))
+
+def snapshot_options(snapshot):
+    return [[{"name": name, "weight": weight} for name, weight in wheel] for wheel in snapshot]
+
+def make_replay(angles, velocities, wheel_options):
+    # The wheels as they were go with the spin, so it can still be checked after its options are edited
+    snapshot = options_snapshot(wheel_options)
+    return {
+        "angles": [float(a) for a in angles],
+        "velocities": [float(v) for v in velocities],
+        "options": snapshot_hash(snapshot),
+        "wheels": snapshot
+    }
+
+def result_string(wheel_options, winners):
+    return " + ".join(wheel_options[i][idx]["name"] for i, idx in enumerate(winners))
+
+def verify_history(history, wheel_options):
+    # Re-simulates every replayable entry, one batch per set of options; returns a status per entry.
+    # Spins recorded with their wheels replay against those; older ones only while the current options still match.
+    statuses = ["no replay"] * len(history)
+    current = options_hash(wheel_options)
+    batches = {}
+    for i, entry in enumerate(history):
+        replay = entry.get("replay")
+        if not replay: continue
+        key = replay.get("options")
+        if key not in batches:
+            if "wheels" in replay:
+                batches[key] = (snapshot_options(replay["wheels"]), [])
+            elif key == current:
+                batches[key] = (wheel_options, [])
+            else:
+                statuses[i] = "options changed"
+                continue
+        options, batch = batches[key]
+        if len(replay["angles"]) != len(options):
+            statuses[i] = "options changed"
+            continue
+        batch.append(i)
+
+    for options, batch in batches.values():
+        if not batch: continue
+        tables = [SliceTable(wheel) for wheel in options]
+        angles = np.array([history[i]["replay"]["angles"] for i in batch], dtype=np.float64)
+        velocities = np.array([history[i]["replay"]["velocities"] for i in batch], dtype=np.float64)
+        _, winners = predict_spins(angles, velocities, tables)
+        for i, row in zip(batch, winners.tolist()):
+            statuses[i] = "ok" if result_string(options, row) == history[i].get("result") else "mismatch"
+    return statuses
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-simulate recorded spins and check they land on the logged result.")
+    parser.add_argument("profile", nargs="?", default="default", help="profile name in profiles/ or a path to a profile JSON")
+    args = parser.parse_args()
+
+    # Logged spins plus any inline history an unmigrated profile still carries
+    data = load_profile_data(args.profile)
+    path = profile_path(args.profile)
+    store = HistoryDB(db_path_for(path)) if data.get("history_backend") == "SQLite" else HistoryLog(log_dir_for(path))
+    history = list(store.iter_newest())
+    history += data.get("history", [])
+    wheel_options = [w["options"] for w in load_wheels(args.profile)]
+
+    statuses = verify_history(history, wheel_options)
+    for entry, status in zip(history, statuses):
+        if status != "ok":
+            print(f"{entry.get('time', '?')}  seed={entry.get('seed', '-')} spin={entry.get('spin', '-')}  {status}: {entry.get('result', '')}")
+    for status in ("ok", "mismatch", "options changed", "no replay"):
+        print(f"{status:>16}: {statuses.count(status)}")
+
+if __name__ == "__main__":
+    main()
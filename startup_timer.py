@@ -0,0 +1,25 @@
+import time
+
+FIRST_PAINT_TARGET_MS = 300
+
+class StartupTimer:
+    # Milestones since the process started; main prints them once the sidebar is up after the first paint
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.marks = []
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.marks.append((label, (now - self.last) * 1000, (now - self.started) * 1000))
+        self.last = now
+
+    def report(self, target_ms=FIRST_PAINT_TARGET_MS, paint_label="first paint"):
+        print("Startup timing:")
+        for label, step, total in self.marks:
+            print(f"  {label:<20}{step:8.1f} ms{total:10.1f} ms")
+        painted = [total for label, _, total in self.marks if label == paint_label]
+        if not painted: return
+        total = painted[0]
+        verdict = "within" if total <= target_ms else "over"
+        print(f"  First paint at {total:.0f} ms, {verdict} the {target_ms} ms target")
@@ -0,0 +1,71 @@
+class StatsAggregate:
+    # Running totals for the stats dashboard, updated once per spin instead of recounted from history
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.total = 0
+        self.results = {}
+        self.players = {}
+        # Results grouped by win count; counts only ever grow by one, so the least and most frequent stay O(1)
+        self.buckets = {}
+        self.min_count = 0
+        self.max_count = 0
+
+    def add(self, result, player="Guest"):
+        self.total += 1
+        old = self.results.get(result, 0)
+        new = old + 1
+        self.results[result] = new
+        if old:
+            bucket = self.buckets[old]
+            del bucket[result]
+            if not bucket:
+                del self.buckets[old]
+                # Nothing else had the old minimum, so everything now has at least one more
+                if self.min_count == old: self.min_count = new
+        else:
+            self.min_count = 1
+        self.buckets.setdefault(new, {})[result] = None
+        if new > self.max_count: self.max_count = new
+
+        stats = self.players.get(player)
+        if stats is None:
+            stats = self.players[player] = {"spins": 0, "results": {}, "top": result}
+        stats["spins"] += 1
+        n = stats["results"][result] = stats["results"].get(result, 0) + 1
+        if n > stats["results"][stats["top"]]: stats["top"] = result
+
+    def rebuild(self, result_counts, player_stats):
+        self.clear()
+        self.total = sum(result_counts.values())
+        self.results = dict(result_counts)
+        for result, n in self.results.items():
+            self.buckets.setdefault(n, {})[result] = None
+        if self.buckets:
+            self.min_count = min(self.buckets)
+            self.max_count = max(self.buckets)
+        for player, stats in player_stats.items():
+            results = dict(stats["results"])
+            top = max(results, key=results.get) if results else ""
+            self.players[player] = {"spins": stats["spins"], "results": results, "top": top}
+
+    def luckiest(self):
+        if not self.total: return None
+        return next(iter(self.buckets[self.max_count]))
+
+    def unluckiest(self):
+        if not self.total: return None
+        return next(iter(self.buckets[self.min_count]))
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "results": self.results,
+            "players": {p: {"spins": s["spins"], "results": s["results"]} for p, s in self.players.items()}
+        }
+
+    def load(self, data):
+        self.rebuild(data.get("results", {}), data.get("players", {}))
+        if self.total != data.get("total", self.total):
+            self.clear()
@@ -1,15 +1,17 @@
 import customtkinter as ctk
 import tkinter as tk
+from virtual_list import VirtualList
+from stats_trends import TrendsWorker, SECTIONS
 
 class StatsDashboard:
     @staticmethod
-    def show(parent, history, theme_colors):
+    def show(parent, stats, theme_colors, open_reader=None):
         dialog = ctk.CTkToplevel(parent)
         dialog.title("Detailed Statistics")
-        dialog.geometry("600x450")
+        dialog.geometry("700x450")
         dialog.attributes("-topmost", True)
         
-        if not history:
+        if not stats.total:
             ctk.CTkLabel(dialog, text="No spin history available! Spin the wheel first.", font=("Arial", 16)).pack(pady=50)
             return
             
@@ -18,29 +20,23 @@ class StatsDashboard:
         
         tab_overall = tabview.add("Overall Stats")
         tab_leaderboard = tabview.add("Leaderboards")
+        trend_tabs = {}
+        if open_reader is not None:
+            for name, _ in SECTIONS:
+                trend_tabs[name] = tabview.add(name)
+                ctk.CTkLabel(trend_tabs[name], text="Computing...", text_color="#aaa").pack(pady=50)
         
-        counts = {}
-        player_counts = {}
-        for h in history:
-            res = h["result"]
-            player = h.get("player", "Guest")
-            
-            counts[res] = counts.get(res, 0) + 1
-            if player not in player_counts:
-                player_counts[player] = {"spins": 0, "results": {}}
-            player_counts[player]["spins"] += 1
-            player_counts[player]["results"][res] = player_counts[player]["results"].get(res, 0) + 1
-            
-        total_spins = len(history)
-        sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        # Running totals kept by show_result, so opening this costs the same however long the history is
+        total_spins = stats.total
+        sorted_counts = sorted(stats.results.items(), key=lambda x: x[1], reverse=True)
         
         # Overall Stats
         header = ctk.CTkFrame(tab_overall)
         header.pack(fill="x", padx=10, pady=10)
         
         ctk.CTkLabel(header, text=f"Total Spins: {total_spins}", font=("Arial", 14, "bold")).pack(side="left", padx=20)
-        ctk.CTkLabel(header, text=f"Luckiest: {sorted_counts[0][0]}", font=("Arial", 14, "bold"), text_color="#55efc4").pack(side="left", padx=20)
-        ctk.CTkLabel(header, text=f"Unluckiest: {sorted_counts[-1][0]}", font=("Arial", 14, "bold"), text_color="#ff7675").pack(side="left", padx=20)
+        ctk.CTkLabel(header, text=f"Luckiest: {stats.luckiest()}", font=("Arial", 14, "bold"), text_color="#55efc4").pack(side="left", padx=20)
+        ctk.CTkLabel(header, text=f"Unluckiest: {stats.unluckiest()}", font=("Arial", 14, "bold"), text_color="#ff7675").pack(side="left", padx=20)
         
         frame = ctk.CTkFrame(tab_overall)
         frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
@@ -52,9 +48,6 @@ class StatsDashboard:
         center_x, center_y, radius = 150, 150, 130
         current_angle = 0
         
-        legend_frame = ctk.CTkScrollableFrame(frame, width=200)
-        legend_frame.pack(side="right", fill="both", expand=True, padx=10, pady=10)
-        
         for i, (result, count) in enumerate(sorted_counts):
             extent = (count / total_spins) * 360
             color = theme_colors[i % len(theme_colors)]
@@ -64,20 +57,117 @@ class StatsDashboard:
                 start=current_angle, extent=extent, fill=color, outline=canvas_bg, width=2
             )
             current_angle += extent
+            
+        def make_legend_row(parent):
+            return ctk.CTkLabel(parent, text="", font=("Arial", 13, "bold"), anchor="w")
+            
+        def fill_legend_row(row, item, i, selected):
+            result, count = item
             pct = int(count/total_spins * 100)
-            ctk.CTkLabel(legend_frame, text=f"■ {result}: {count} ({pct}%)", text_color=color, font=("Arial", 13, "bold"), anchor="w").pack(fill="x", pady=2)
+            row.configure(text=f"■ {result}: {count} ({pct}%)", text_color=theme_colors[i % len(theme_colors)])
+            
+        # Legend and leaderboard only build widgets for the rows on screen
+        legend = VirtualList(frame, 28, make_legend_row, fill_legend_row, width=200)
+        legend.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+        legend.set_items(sorted_counts)
             
         # Leaderboards
-        lb_scroll = ctk.CTkScrollableFrame(tab_leaderboard)
-        lb_scroll.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        sorted_players = sorted(player_counts.items(), key=lambda x: x[1]["spins"], reverse=True)
-        for i, (player, stats) in enumerate(sorted_players):
-            p_frame = ctk.CTkFrame(lb_scroll)
-            p_frame.pack(fill="x", pady=5)
+        def make_player_row(parent):
+            p_frame = ctk.CTkFrame(parent)
+            p_frame.rank_label = ctk.CTkLabel(p_frame, text="", font=("Arial", 16, "bold"), text_color="#fdcb6e")
+            p_frame.rank_label.pack(side="left", padx=10, pady=10)
+            p_frame.spins_label = ctk.CTkLabel(p_frame, text="")
+            p_frame.spins_label.pack(side="left", padx=20)
+            p_frame.top_label = ctk.CTkLabel(p_frame, text="")
+            p_frame.top_label.pack(side="left", padx=20)
+            return p_frame
             
-            top_res = sorted(stats["results"].items(), key=lambda x: x[1], reverse=True)[0]
+        def fill_player_row(p_frame, item, i, selected):
+            player, p_stats = item
+            top_res = p_stats["top"]
+            p_frame.rank_label.configure(text=f"#{i+1} {player}")
+            p_frame.spins_label.configure(text=f"Wins/Spins: {p_stats['spins']}")
+            p_frame.top_label.configure(text=f"Luckiest Item: {top_res} ({p_stats['results'][top_res]} times)")
             
-            ctk.CTkLabel(p_frame, text=f"#{i+1} {player}", font=("Arial", 16, "bold"), text_color="#fdcb6e").pack(side="left", padx=10, pady=10)
-            ctk.CTkLabel(p_frame, text=f"Wins/Spins: {stats['spins']}").pack(side="left", padx=20)
-            ctk.CTkLabel(p_frame, text=f"Luckiest Item: {top_res[0]} ({top_res[1]} times)").pack(side="left", padx=20)
+        sorted_players = sorted(stats.players.items(), key=lambda x: x[1]["spins"], reverse=True)
+        leaderboard = VirtualList(tab_leaderboard, 58, make_player_row, fill_player_row)
+        leaderboard.pack(fill="both", expand=True, padx=10, pady=10)
+        leaderboard.set_items(sorted_players)
+        
+        if open_reader is not None:
+            # Breakdowns are computed on a worker thread; each tab fills in as soon as its section is ready
+            worker = TrendsWorker(open_reader).start()
+            def poll():
+                if not dialog.winfo_exists(): return
+                for name, data in worker.poll():
+                    if name is None:
+                        if data is None: return
+                        for tab in trend_tabs.values():
+                            StatsDashboard.replace_tab(tab)
+                            ctk.CTkLabel(tab, text=f"Could not compute: {data}", text_color="#ff7675").pack(pady=50)
+                        continue
+                    StatsDashboard.replace_tab(trend_tabs[name])
+                    StatsDashboard.render_section(trend_tabs[name], name, data, theme_colors)
+                dialog.after(50, poll)
+            dialog.after(50, poll)
+
+    @staticmethod
+    def replace_tab(tab):
+        for widget in tab.winfo_children():
+            widget.destroy()
+
+    @staticmethod
+    def text_list(tab, lines):
+        def make_row(parent):
+            return ctk.CTkLabel(parent, text="", anchor="w")
+        def fill_row(row, line, i, selected):
+            row.configure(text=line)
+        rows = VirtualList(tab, 26, make_row, fill_row)
+        rows.pack(fill="both", expand=True, padx=10, pady=10)
+        rows.set_items(lines)
+
+    @staticmethod
+    def render_section(tab, name, data, theme_colors):
+        if not data:
+            ctk.CTkLabel(tab, text="Not enough history yet.", text_color="#aaa").pack(pady=50)
+        elif name == "Hourly":
+            lines = [f"{hour:02d}:00   {n} spins   top: {top} ({k})" for hour, n, top, k in data if n]
+            StatsDashboard.text_list(tab, lines)
+        elif name == "Daily":
+            lines = [f"{day}   {n} spins   top: {top} ({k})" for day, n, top, k in reversed(data)]
+            StatsDashboard.text_list(tab, lines)
+        elif name == "Streams":
+            lines = [f"#{i}  {start} -> {end[11:]}   {n} spins   top: {top} ({k})" for i, start, end, n, top, k in reversed(data)]
+            StatsDashboard.text_list(tab, lines)
+        elif name == "Streaks":
+            lines = [f"{player}: best {best}x {best_res}, current {cur}x {cur_res}" for player, best, best_res, cur, cur_res in data]
+            StatsDashboard.text_list(tab, lines)
+        elif name == "Trends":
+            StatsDashboard.draw_trends(tab, data, theme_colors)
+
+    @staticmethod
+    def draw_trends(tab, trends, theme_colors):
+        # Rolling win rate per option; the dashed line is the option's all-time share
+        frame = ctk.CTkFrame(tab)
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+        canvas_bg = frame._apply_appearance_mode(frame._fg_color)
+        w, h, pad = 460, 280, 30
+        canvas = tk.Canvas(frame, bg=canvas_bg, highlightthickness=0, width=w, height=h)
+        canvas.pack(side="left", padx=10, pady=10)
+        legend = ctk.CTkFrame(frame, fg_color="transparent")
+        legend.pack(side="right", fill="y", padx=10, pady=10)
+
+        top = max(max(rates) for _, _, rates in trends) or 1.0
+        canvas.create_text(pad - 4, pad, text=f"{int(top * 100)}%", anchor="e", fill="#aaa", font=("Arial", 9))
+        canvas.create_text(pad - 4, h - pad, text="0%", anchor="e", fill="#aaa", font=("Arial", 9))
+        for i, (name, share, rates) in enumerate(trends):
+            color = theme_colors[i % len(theme_colors)]
+            step = (w - 2 * pad) / max(1, len(rates) - 1)
+            coords = []
+            for j, rate in enumerate(rates):
+                coords += [pad + j * step, h - pad - rate / top * (h - 2 * pad)]
+            if len(coords) >= 4:
+                canvas.create_line(*coords, fill=color, width=2)
+            y = h - pad - share / top * (h - 2 * pad)
+            canvas.create_line(pad, y, w - pad, y, fill=color, dash=(3, 3))
+            ctk.CTkLabel(legend, text=f"■ {name} ({share * 100:.1f}%)", text_color=color, anchor="w").pack(fill="x")
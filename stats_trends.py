@@ -0,0 +1,141 @@
+import queue
+import threading
+import numpy as np
+
+STREAM_GAP_SECONDS = 2 * 3600
+ROLLING_WINDOW = 100
+TREND_POINTS = 200
+TREND_OPTIONS = 6
+
+def intern(values):
+    # Strings become small integer codes so every group-by below is a bincount
+    codes = {}
+    ids = np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype=np.int64, count=len(values))
+    return ids, list(codes)
+
+def parse_times(times):
+    try:
+        return np.array(times, dtype="datetime64[s]")
+    except ValueError:
+        out = np.empty(len(times), dtype="datetime64[s]")
+        for i, t in enumerate(times):
+            try: out[i] = np.datetime64(t, "s")
+            except: out[i] = np.datetime64("NaT")
+        return out
+
+class HistoryArrays:
+    def __init__(self, entries):
+        times, results, players = [], [], []
+        for entry in entries:
+            times.append(entry.get("time") or "NaT")
+            results.append(entry.get("result", ""))
+            players.append(entry.get("player", "Guest"))
+        t = parse_times(times)
+        # Logs are chronological, but migrated or imported history may not be; NaT sorts last
+        order = np.argsort(t, kind="stable")
+        self.times = t[order]
+        result_ids, self.result_names = intern(results)
+        player_ids, self.player_names = intern(players)
+        self.results = result_ids[order]
+        self.players = player_ids[order]
+        self.timed = ~np.isnat(self.times)
+
+    def __len__(self):
+        return len(self.results)
+
+def group_top(keys, codes, n_keys, n_codes):
+    # Spins and most frequent result per key, from one 2-D histogram
+    counts = np.bincount(keys * n_codes + codes, minlength=n_keys * n_codes).reshape(n_keys, n_codes)
+    top = counts.argmax(axis=1)
+    return counts.sum(axis=1), top, counts[np.arange(n_keys), top]
+
+def hourly(h):
+    t = h.times[h.timed]
+    hours = ((t - t.astype("datetime64[D]")) // np.timedelta64(1, "h")).astype(np.int64)
+    totals, top, top_n = group_top(hours, h.results[h.timed], 24, len(h.result_names))
+    return [(hour, int(totals[hour]), h.result_names[top[hour]] if totals[hour] else "", int(top_n[hour])) for hour in range(24)]
+
+def daily(h):
+    days, day_ids = np.unique(h.times[h.timed].astype("datetime64[D]"), return_inverse=True)
+    totals, top, top_n = group_top(day_ids.reshape(-1), h.results[h.timed], len(days), len(h.result_names))
+    return [(str(day), int(n), h.result_names[r], int(k)) for day, n, r, k in zip(days, totals, top, top_n)]
+
+def streams(h):
+    # A stream is a run of spins with no gap longer than STREAM_GAP_SECONDS
+    t = h.times[h.timed]
+    if not len(t): return []
+    gaps = np.diff(t) > np.timedelta64(STREAM_GAP_SECONDS, "s")
+    ids = np.concatenate(([0], np.cumsum(gaps)))
+    n = int(ids[-1]) + 1
+    totals, top, top_n = group_top(ids, h.results[h.timed], n, len(h.result_names))
+    starts = np.flatnonzero(np.concatenate(([True], gaps)))
+    ends = np.concatenate((starts[1:], [len(t)])) - 1
+    return [(i + 1, str(t[s]).replace("T", " "), str(t[e]).replace("T", " "), int(totals[i]), h.result_names[top[i]], int(top_n[i]))
+            for i, (s, e) in enumerate(zip(starts, ends))]
+
+def rolling_rates(h, window=ROLLING_WINDOW, points=TREND_POINTS, options=TREND_OPTIONS):
+    # Win rate of the most common options over the last `window` spins, sampled down to `points` values
+    n = len(h)
+    if n < window: return []
+    overall = np.bincount(h.results, minlength=len(h.result_names))
+    sample = np.unique(np.linspace(window, n, min(points, n - window + 1)).astype(np.int64))
+    trends = []
+    for code in np.argsort(overall)[::-1][:options]:
+        cs = np.concatenate(([0], np.cumsum(h.results == code)))
+        rates = (cs[sample] - cs[sample - window]) / window
+        trends.append((h.result_names[code], overall[code] / n, rates.tolist()))
+    return trends
+
+def streaks(h):
+    # Longest and current run of the same result within each player's own spins
+    n = len(h)
+    if not n: return []
+    order = np.lexsort((np.arange(n), h.players))
+    p, r = h.players[order], h.results[order]
+    starts = np.flatnonzero(np.concatenate(([True], (p[1:] != p[:-1]) | (r[1:] != r[:-1]))))
+    lengths = np.diff(np.concatenate((starts, [n])))
+    run_player, run_result = p[starts], r[starts]
+
+    by_length = np.lexsort((-lengths, run_player))
+    first = np.concatenate(([True], run_player[by_length][1:] != run_player[by_length][:-1]))
+    longest = by_length[first]
+    last = np.flatnonzero(np.concatenate((run_player[1:] != run_player[:-1], [True])))
+    out = []
+    for best, cur in zip(longest, last):
+        out.append((h.player_names[run_player[best]], int(lengths[best]), h.result_names[run_result[best]],
+                    int(lengths[cur]), h.result_names[run_result[cur]]))
+    return sorted(out, key=lambda x: x[1], reverse=True)
+
+SECTIONS = [("Hourly", hourly), ("Daily", daily), ("Streams", streams), ("Trends", rolling_rates), ("Streaks", streaks)]
+
+class TrendsWorker:
+    # Computes each section on a thread and hands results back through a queue the UI polls,
+    # so tabs fill in one by one while the dashboard stays responsive
+    def __init__(self, open_reader):
+        self.open_reader = open_reader
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            reader = self.open_reader()
+            try:
+                h = HistoryArrays(reader)
+            finally:
+                reader.close()
+            for name, compute in SECTIONS:
+                self.results.put((name, compute(h)))
+        except Exception as e:
+            print("Failed to compute trends:", e)
+            self.results.put((None, e))
+        self.results.put((None, None))
+
+    def poll(self):
+        items = []
+        while True:
+            try: items.append(self.results.get_nowait())
+            except queue.Empty: return items
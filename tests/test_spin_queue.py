@@ -0,0 +1,120 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spin_queue import SpinQueue
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class Wheel:
+    # Stands in for the app: a started spin keeps the wheel busy until finish()
+    def __init__(self):
+        self.busy = False
+        self.started = []
+
+    def start(self, request):
+        self.started.append(request)
+        self.busy = True
+        return True
+
+    def is_busy(self):
+        return self.busy
+
+def make_queue(policy="Queue", **kwargs):
+    clock = FakeClock()
+    wheel = Wheel()
+    queue = SpinQueue(wheel.start, wheel.is_busy, policy=policy, clock=clock, **kwargs)
+    return queue, wheel, clock
+
+def finish(queue, wheel):
+    wheel.busy = False
+    queue.on_spin_finished()
+
+def test_queue_policy_runs_requests_in_order():
+    queue, wheel, clock = make_queue()
+    assert queue.submit("a") == "started"
+    assert queue.submit("b") == "queued"
+    assert queue.submit("c") == "queued"
+    finish(queue, wheel)
+    finish(queue, wheel)
+    assert [r.user for r in wheel.started] == ["a", "b", "c"]
+
+def test_queue_policy_caps_depth():
+    queue, wheel, clock = make_queue(max_depth=1)
+    assert queue.submit("a") == "started"
+    assert queue.submit("b") == "queued"
+    assert queue.submit("c") == "full"
+
+def test_coalesce_policy_folds_into_waiting_spin():
+    queue, wheel, clock = make_queue("Coalesce")
+    assert queue.submit("a") == "started"
+    assert queue.submit("b") == "queued"
+    assert queue.submit("c") == "coalesced"
+    assert queue.submit("d") == "coalesced"
+    assert queue.pending[0].users == ["b", "c", "d"]
+
+def test_drop_policy_rejects_while_busy():
+    queue, wheel, clock = make_queue("Drop")
+    assert queue.submit("a") == "started"
+    assert queue.submit("b") == "busy"
+
+def test_retry_after_drop_is_admitted():
+    queue, wheel, clock = make_queue("Drop")
+    outcomes = []
+    for t in range(0, 64, 8):
+        clock.now = t
+        wheel.busy = t < 16
+        outcomes.append(queue.submit("v"))
+    assert outcomes[:3] == ["busy", "busy", "started"]
+
+def test_retry_after_finished_spin_is_admitted():
+    queue, wheel, clock = make_queue(user_cooldown=5, dedupe_window=10)
+    assert queue.submit("a") == "started"
+    finish(queue, wheel)
+    clock.now = 11
+    assert queue.submit("a") == "started"
+
+def test_duplicate_within_window():
+    queue, wheel, clock = make_queue(user_cooldown=0, dedupe_window=10)
+    assert queue.submit("a") == "started"
+    clock.now = 5
+    assert queue.submit("a") == "duplicate"
+    assert queue.submit("a", "!spin please") == "queued"
+
+def test_user_cooldown():
+    queue, wheel, clock = make_queue(user_cooldown=60, dedupe_window=10)
+    assert queue.submit("a") == "started"
+    finish(queue, wheel)
+    clock.now = 30
+    assert queue.submit("a") == "cooldown"
+    clock.now = 61
+    assert queue.submit("a") == "started"
+
+def test_token_bucket_limits_and_refills():
+    queue, wheel, clock = make_queue(rate=0.1, burst=2, user_cooldown=0)
+    assert queue.submit("a") == "started"
+    assert queue.submit("b") == "queued"
+    assert queue.submit("c") == "rate"
+    clock.now = 10
+    assert queue.submit("c") == "queued"
+
+def test_failed_start_refunds_token_and_cooldown():
+    clock = FakeClock()
+    queue = SpinQueue(lambda request: False, lambda: False, burst=1, dedupe_window=0, clock=clock)
+    assert queue.submit("a") == "failed"
+    assert queue.submit("a") == "failed"
+    assert queue.bucket.tokens == 1
+    assert "a" not in queue.last_accepted
+
+def test_clear_resets_active():
+    queue, wheel, clock = make_queue()
+    queue.submit("a")
+    queue.submit("b")
+    queue.clear()
+    assert not queue.active and not queue.pending
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import threading
+import pyttsx3
+
+class TTSWorker:
+    # pyttsx3 engines are not thread-safe, so one long-lived thread owns the engine and does all speaking and rendering.
+    # Only one live announcement can wait: a newer one replaces it, since a stale winner is worse than none.
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.cond = threading.Condition()
+        self.say_text = None
+        self.render_queue = []
+        self.dropped = 0
+        self.available = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def wav_path(self, text):
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, digest + ".wav")
+
+    def is_rendered(self, text):
+        return os.path.exists(self.wav_path(text))
+
+    def say(self, text):
+        if not self.available: return
+        with self.cond:
+            if self.say_text is not None:
+                self.dropped += 1
+            self.say_text = text
+            self.cond.notify()
+
+    def prerender(self, texts):
+        # Renders each phrase to a WAV once; the files persist, so later sessions only render new names
+        if not self.available: return
+        with self.cond:
+            queued = set(self.render_queue)
+            for text in dict.fromkeys(texts):
+                if text and text not in queued and not self.is_rendered(text):
+                    self.render_queue.append(text)
+            self.cond.notify()
+
+    def next_job(self):
+        with self.cond:
+            while self.say_text is None and not self.render_queue:
+                self.cond.wait()
+            # Announcements jump ahead of rendering, which only ever holds them up by one phrase
+            if self.say_text is not None:
+                text, self.say_text = self.say_text, None
+                return "say", text
+            return "render", self.render_queue.pop(0)
+
+    def run(self):
+        try:
+            engine = pyttsx3.init()
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except Exception as e:
+            print("Text to speech unavailable:", e)
+            self.available = False
+            return
+        while True:
+            kind, text = self.next_job()
+            try:
+                if kind == "say":
+                    engine.say(text)
+                    engine.runAndWait()
+                else:
+                    # Rendered beside the target and renamed, so a player never picks up half a file
+                    path = self.wav_path(text)
+                    tmp_path = path[:-4] + ".tmp.wav"
+                    engine.save_to_file(text, tmp_path)
+                    engine.runAndWait()
+                    if os.path.exists(tmp_path):
+                        os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Text to speech failed for {text!r}:", e)
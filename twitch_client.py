@@ -1,44 +1,224 @@
-import socket
+import asyncio
+import queue
+import random
 import threading
 
+HOST = "irc.chat.twitch.tv"
+PORT = 6667
+ANON_NICK = "justinfan12345" # Anonymous read-only nick
+COMMANDS = ("!spin",)
+# IRCv3 allows 8191 bytes of tags on top of the classic 512-byte line
+MAX_LINE = 8192 + 512
+EVENT_QUEUE_SIZE = 1000
+CONNECT_TIMEOUT = 10.0
+KEEPALIVE_SECONDS = 60.0
+PONG_TIMEOUT = 15.0
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+
+TAG_ESCAPES = {":": ";", "s": " ", "\\": "\\", "r": "\r", "n": "\n"}
+
+def unescape_tag(value):
+    if "\\" not in value: return value
+    out = []
+    i = 0
+    while i < len(value):
+        c = value[i]
+        if c == "\\" and i + 1 < len(value):
+            i += 1
+            out.append(TAG_ESCAPES.get(value[i], value[i]))
+        elif c != "\\":
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+class IrcMessage:
+    __slots__ = ("tags", "prefix", "command", "params")
+
+    def __init__(self, tags, prefix, command, params):
+        self.tags = tags
+        self.prefix = prefix
+        self.command = command
+        self.params = params
+
+    @property
+    def nick(self):
+        return self.prefix.split("!", 1)[0] if self.prefix else ""
+
+    @property
+    def text(self):
+        return self.params[-1] if self.params else ""
+
+    def command_word(self):
+        # "!spin please" -> "!spin"
+        parts = self.text.split(None, 1)
+        return parts[0].lower() if parts else ""
+
+def parse_line(line):
+    # @tags :prefix COMMAND middle params :trailing param
+    tags = {}
+    if line.startswith("@"):
+        raw_tags, _, line = line[1:].partition(" ")
+        for item in raw_tags.split(";"):
+            key, _, value = item.partition("=")
+            if key: tags[key] = unescape_tag(value)
+        line = line.lstrip(" ")
+    prefix = ""
+    if line.startswith(":"):
+        prefix, _, line = line[1:].partition(" ")
+        line = line.lstrip(" ")
+    line, sep, trailing = line.partition(" :")
+    if not sep and line.startswith(":"):
+        line, trailing, sep = "", line[1:], True
+    parts = line.split()
+    command = parts[0].upper() if parts else ""
+    params = parts[1:]
+    if sep: params.append(trailing)
+    return IrcMessage(tags, prefix, command, params)
+
+def normalize_token(token):
+    token = token.strip()
+    return token if not token or token.startswith("oauth:") else f"oauth:{token}"
+
 class TwitchClient:
-    def __init__(self, channel, token, on_spin_command):
+    # Chat is read and parsed on an asyncio loop in its own thread. Only chat commands reach the UI,
+    # through a bounded queue it drains on a timer, so a busy channel costs the Tk thread next to nothing.
+    def __init__(self, channel, token, host=HOST, port=PORT):
         self.channel = channel.lower().strip()
-        self.token = token.strip() if token.strip().startswith('oauth:') else f'oauth:{token.strip()}'
-        self.on_spin_command = on_spin_command
-        self.sock = None
+        self.token = normalize_token(token)
+        self.host = host
+        self.port = port
+        self.events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
         self.running = False
         self.thread = None
+        self.loop = None
+        self.task = None
+        self.writer = None
+        self.lines = 0
+        self.commands = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.welcomed = False
 
     def start(self):
+        self.channel = self.channel.lower().strip().lstrip("#")
+        self.token = normalize_token(self.token)
         if not self.channel or not self.token: return False
+        self.stop()
         self.running = True
-        self.thread = threading.Thread(target=self._listen, daemon=True)
+        self.thread = threading.Thread(target=self.run_loop, daemon=True)
         self.thread.start()
         return True
 
     def stop(self):
         self.running = False
-        if self.sock:
-            try: self.sock.close()
-            except: pass
+        loop, task = self.loop, self.task
+        if loop and task:
+            try: loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError: pass # Loop already closed
+
+    def drain(self, limit=EVENT_QUEUE_SIZE):
+        # Called on the UI thread; never blocks
+        items = []
+        while len(items) < limit:
+            try: items.append(self.events.get_nowait())
+            except queue.Empty: break
+        return items
+
+    def run_loop(self):
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(self.run())
+        self.loop, self.task = loop, task
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+            # A reconnect from the UI may already have started the next loop
+            if self.task is task:
+                self.loop = self.task = None
 
-    def _listen(self):
-        self.sock = socket.socket()
+    async def run(self):
+        delay = BACKOFF_MIN
+        while self.running:
+            self.welcomed = False
+            try:
+                await self.session()
+            except PermissionError as e:
+                # Retrying a rejected token only gets the connection throttled
+                print("Twitch login failed:", e)
+                self.running = False
+                return
+            except asyncio.IncompleteReadError:
+                print("Twitch connection closed by the server")
+            except (OSError, EOFError, asyncio.TimeoutError) as e:
+                print("Twitch connection lost:", e or type(e).__name__)
+            except Exception as e:
+                print("Twitch Client Error:", e)
+            if not self.running: return
+            # A connection that got as far as the welcome starts the backoff over
+            if self.welcomed: delay = BACKOFF_MIN
+            wait = delay * random.uniform(0.5, 1.0)
+            print(f"Reconnecting to Twitch in {wait:.1f}s")
+            await asyncio.sleep(wait)
+            delay = min(BACKOFF_MAX, delay * 2)
+            self.reconnects += 1
+
+    async def session(self):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port, limit=MAX_LINE), CONNECT_TIMEOUT)
+        self.writer = writer
+        keepalive = None
         try:
-            self.sock.connect(('irc.chat.twitch.tv', 6667))
-            self.sock.send(f"PASS {self.token}\n".encode('utf-8'))
-            self.sock.send(f"NICK justinfan12345\n".encode('utf-8')) # Anonymous read-only nick
-            self.sock.send(f"JOIN #{self.channel}\n".encode('utf-8'))
-            
+            self.send("CAP REQ :twitch.tv/tags twitch.tv/commands")
+            self.send(f"PASS {self.token}")
+            self.send(f"NICK {ANON_NICK}")
+            self.send(f"JOIN #{self.channel}")
+            await writer.drain()
+            keepalive = asyncio.create_task(self.keepalive())
+            skip = False
             while self.running:
-                resp = self.sock.recv(2048).decode('utf-8')
-                if resp.startswith('PING'):
-                    self.sock.send("PONG\n".encode('utf-8'))
-                elif len(resp) > 0:
-                    lines = resp.split('\n')
-                    for line in lines:
-                        if "PRIVMSG" in line and "!spin" in line.lower():
-                            self.on_spin_command()
-        except Exception as e:
-            print("Twitch Client Error:", e)
+                try:
+                    # Silence past a keepalive round trip means the connection is dead even if the socket is not
+                    raw = await asyncio.wait_for(reader.readuntil(b"\n"), KEEPALIVE_SECONDS + PONG_TIMEOUT)
+                except asyncio.LimitOverrunError as e:
+                    # An over-long line is thrown away up to where the next one starts
+                    await reader.readexactly(e.consumed)
+                    skip = True
+                    continue
+                if skip:
+                    skip = False
+                    continue
+                self.handle(raw)
+        finally:
+            if keepalive: keepalive.cancel()
+            self.writer = None
+            writer.close()
+
+    async def keepalive(self):
+        while True:
+            await asyncio.sleep(KEEPALIVE_SECONDS)
+            self.send("PING :tmi.twitch.tv")
+
+    def send(self, line):
+        if self.writer: self.writer.write(f"{line}\r\n".encode("utf-8"))
+
+    def handle(self, raw):
+        self.lines += 1
+        # Ordinary chat is by far the bulk of the traffic and cannot be a command unless its text starts with "!"
+        if b" PRIVMSG " in raw and b" :!" not in raw: return
+        # Lines are complete here, so multibyte characters are never split
+        msg = parse_line(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+        if msg.command == "PRIVMSG":
+            if msg.command_word() in COMMANDS:
+                self.commands += 1
+                try: self.events.put_nowait(msg)
+                except queue.Full: self.dropped += 1
+        elif msg.command == "PING":
+            self.send(f"PONG :{msg.text}")
+        elif msg.command == "RECONNECT":
+            raise EOFError("server asked to reconnect")
+        elif msg.command == "NOTICE" and "authentication failed" in msg.text.lower():
+            raise PermissionError(msg.text)
+        elif msg.command == "001":
+            self.welcomed = True
@@ -0,0 +1,196 @@
+import argparse
+import asyncio
+import itertools
+import random
+import time
+import zlib
+
+SERVER_NAME = "tmi.twitch.tv"
+CHAT_LINES = ["hello chat", "PogChamp", "lets go!!", "gg", "what did it land on?", "spin it again",
+              "ünïcödé and emoji ✨🎉", "LUL", "first time here", "is this rigged KEKW"]
+
+def escape_tag(value):
+    return value.replace("\\", "\\\\").replace(";", "\\:").replace(" ", "\\s").replace("\r", "\\r").replace("\n", "\\n")
+
+class StandinClient:
+    def __init__(self, writer):
+        self.writer = writer
+        self.nick = None
+        self.tags = False
+        self.channels = set()
+
+    def send(self, line):
+        self.writer.write(line.encode("utf-8") + b"\r\n")
+
+class TwitchStandin:
+    # A local stand-in for irc.chat.twitch.tv speaking the subset TwitchClient uses: CAP, PASS, NICK, JOIN, PART,
+    # PING/PONG and PRIVMSG with IRCv3 tags. Messages from one client are relayed to the others in the channel,
+    # and broadcast() injects chat as if other users had typed it.
+    def __init__(self, host="127.0.0.1", port=6667):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.clients = set()
+        self.tasks = set()
+        self.ids = itertools.count(1)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        # Port 0 picks a free port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+        for client in list(self.clients):
+            client.writer.close()
+        # Handlers see EOF and finish on their own rather than being cancelled mid-read at loop shutdown
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.server:
+            await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        client = StandinClient(writer)
+        self.clients.add(client)
+        task = asyncio.current_task()
+        self.tasks.add(task)
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw: break
+                self.command(client, raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients.discard(client)
+            self.tasks.discard(task)
+            writer.close()
+
+    def command(self, client, line):
+        cmd, _, rest = line.partition(" ")
+        cmd = cmd.upper()
+        if cmd == "CAP" and rest.startswith("REQ"):
+            caps = rest.partition(":")[2]
+            client.tags = "twitch.tv/tags" in caps
+            client.send(f":{SERVER_NAME} CAP * ACK :{caps}")
+        elif cmd == "NICK":
+            client.nick = rest.strip().lower()
+            n = client.nick
+            for code, text in (("001", "Welcome, GLHF!"), ("002", f"Your host is {SERVER_NAME}"), ("003", "This server is rather new"),
+                               ("004", "-"), ("375", "-"), ("372", "You are in a maze of twisty passages, all alike."), ("376", ">")):
+                client.send(f":{SERVER_NAME} {code} {n} :{text}")
+        elif cmd == "JOIN":
+            for channel in rest.split(","):
+                channel = channel.strip().lower()
+                client.channels.add(channel)
+                n = client.nick
+                client.send(f":{n}!{n}@{n}.{SERVER_NAME} JOIN {channel}")
+                client.send(f":{n}.{SERVER_NAME} 353 {n} = {channel} :{n}")
+                client.send(f":{n}.{SERVER_NAME} 366 {n} {channel} :End of /NAMES list")
+        elif cmd == "PART":
+            client.channels.discard(rest.strip().lower())
+        elif cmd == "PING":
+            client.send(f":{SERVER_NAME} PONG {SERVER_NAME} :{rest.lstrip(':')}")
+        elif cmd == "PRIVMSG":
+            channel, _, text = rest.partition(" :")
+            self.broadcast(channel.strip().lower(), client.nick or "anonymous", text, exclude=client)
+        # PASS, PONG and anything else need no reply
+
+    def chat_lines(self, channel, user, text):
+        # The same message with and without tags, built once however many clients receive it
+        plain = f":{user}!{user}@{user}.{SERVER_NAME} PRIVMSG {channel} :{text}\r\n"
+        tags = {"badge-info": "", "badges": "", "color": "", "display-name": user, "emotes": "", "first-msg": "0", "flags": "",
+                "id": f"standin-{next(self.ids)}", "mod": "0", "room-id": "1", "subscriber": "0",
+                "tmi-sent-ts": str(int(time.time() * 1000)), "turbo": "0", "user-id": str(zlib.crc32(user.encode("utf-8"))), "user-type": ""}
+        tagged = "@" + ";".join(f"{k}={escape_tag(v)}" for k, v in tags.items()) + " " + plain
+        return tagged.encode("utf-8"), plain.encode("utf-8")
+
+    def broadcast(self, channel, user, text, exclude=None):
+        self.broadcast_many(channel, [(user, text)], exclude)
+
+    def broadcast_many(self, channel, messages, exclude=None):
+        # One write per client per batch, so a 10k msg/s load is a few hundred writes a second
+        lines = [self.chat_lines(channel, user, text) for user, text in messages]
+        tagged = plain = None
+        for client in self.clients:
+            if client is exclude or channel not in client.channels: continue
+            if client.tags:
+                tagged = tagged or b"".join(t for t, _ in lines)
+                client.writer.write(tagged)
+            else:
+                plain = plain or b"".join(p for _, p in lines)
+                client.writer.write(plain)
+
+    def send_all(self, line):
+        # e.g. "RECONNECT" or "PING :tmi.twitch.tv" to exercise the client's handling
+        for client in self.clients:
+            client.send(f":{SERVER_NAME} {line}")
+
+class ChatLoad:
+    # Synthetic chat at a fixed message rate, a spin_ratio share of it "!spin" from random users
+    def __init__(self, server, channel, rate, spin_ratio=0.01, users=500, seed=0, tick=0.01):
+        self.server = server
+        self.channel = "#" + channel.lower().lstrip("#")
+        self.rate = rate
+        self.spin_ratio = spin_ratio
+        self.users = [f"viewer{i}" for i in range(users)]
+        self.rng = random.Random(seed)
+        self.tick = tick
+        self.sent = 0
+        self.spins = 0
+
+    def message(self):
+        user = self.rng.choice(self.users)
+        if self.rng.random() < self.spin_ratio:
+            self.spins += 1
+            return user, "!spin"
+        return user, self.rng.choice(CHAT_LINES)
+
+    async def run(self, seconds):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        sent = 0
+        while True:
+            elapsed = loop.time() - start
+            if elapsed >= seconds: break
+            # Catch up to where the schedule says we should be, so timer jitter does not lower the rate
+            due = int(self.rate * elapsed) - sent
+            if due > 0:
+                self.server.broadcast_many(self.channel, [self.message() for _ in range(due)])
+                sent += due
+            await asyncio.sleep(self.tick)
+        self.sent += sent
+        return sent
+
+async def serve(args):
+    server = await TwitchStandin(args.host, args.port).start()
+    print(f"Twitch stand-in listening on {args.host}:{server.port}")
+    try:
+        if args.rate > 0:
+            load = ChatLoad(server, args.channel, args.rate, args.spin_ratio, seed=args.seed)
+            while True:
+                await load.run(60)
+                print(f"Sent {load.sent} messages ({load.spins} spins)")
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for Twitch chat, optionally with synthetic load.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6667)
+    parser.add_argument("--channel", default="standin")
+    parser.add_argument("--rate", type=float, default=0, help="synthetic chat messages per second")
+    parser.add_argument("--spin-ratio", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import customtkinter as ctk
+import tkinter as tk
+
+class VirtualList(ctk.CTkFrame):
+    # Only the rows in the viewport exist as widgets. Item i always lands in slot i % len(pool), so
+    # scrolling by one row refills a single widget instead of all of them.
+    def __init__(self, master, row_height, make_row, fill_row, on_select=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.make_row = make_row
+        self.fill_row = fill_row
+        self.on_select = on_select
+        self.count = 0
+        self.fetch = lambda offset, limit: []
+        self.selected = None
+        self.pool = []
+        self.slot_index = []
+        self.window_ids = []
+        self.first = None
+
+        bg = self._apply_appearance_mode(self._fg_color)
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, yscrollincrement=row_height)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", self.on_configure)
+        self.bind_scroll(self.canvas)
+
+    def set_items(self, items):
+        self.set_source(len(items), lambda offset, limit: items[offset:offset + limit])
+
+    def set_source(self, count, fetch):
+        # fetch(offset, limit) returns the items for one window, e.g. HistoryLog.page
+        self.count = count
+        self.fetch = fetch
+        if self.selected is not None and self.selected >= count:
+            self.selected = None
+        self.canvas.configure(scrollregion=(0, 0, 1, count * self.row_height))
+        self.refresh()
+
+    def refresh(self):
+        self.slot_index = [None] * len(self.pool)
+        self.first = None
+        self.render()
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.render()
+
+    def on_configure(self, event):
+        for item in self.window_ids:
+            self.canvas.itemconfigure(item, width=event.width)
+        self.render()
+
+    def bind_scroll(self, widget):
+        # Raw Tk binds on every widget in the row: CTk widgets are several Tk widgets deep and events do not bubble
+        tk.Misc.bind(widget, "<MouseWheel>", self.on_wheel, "+")
+        tk.Misc.bind(widget, "<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"), "+")
+        tk.Misc.bind(widget, "<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"), "+")
+        for child in widget.winfo_children():
+            self.bind_scroll(child)
+
+    def on_wheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step * max(1, abs(event.delta) // 120), "units")
+
+    def grow_pool(self, size):
+        width = self.canvas.winfo_width()
+        while len(self.pool) < size:
+            slot = len(self.pool)
+            row = self.make_row(self.canvas)
+            self.bind_scroll(row)
+            self.bind_click(row, slot)
+            self.pool.append(row)
+            self.slot_index.append(None)
+            self.window_ids.append(self.canvas.create_window(0, 0, window=row, anchor="nw", width=width, height=self.row_height, state="hidden"))
+        # Slots are assigned by index modulo the pool size, so a bigger pool remaps every row
+        self.slot_index = [None] * len(self.pool)
+
+    def bind_click(self, widget, slot):
+        tk.Misc.bind(widget, "<Button-1>", lambda e: self.select_slot(slot), "+")
+        for child in widget.winfo_children():
+            self.bind_click(child, slot)
+
+    def select_slot(self, slot):
+        index = self.slot_index[slot]
+        if index is None: return
+        self.select(index)
+        if self.on_select:
+            self.on_select(index)
+
+    def select(self, index):
+        self.selected = index
+        self.refresh()
+
+    def render(self):
+        visible = max(1, self.canvas.winfo_height() // self.row_height + 2)
+        if visible > len(self.pool):
+            self.grow_pool(visible)
+            self.first = None
+
+        first = max(0, int(self.canvas.canvasy(0) // self.row_height))
+        if first == self.first: return
+        self.first = first
+        items = self.fetch(first, max(0, min(len(self.pool), self.count - first)))
+
+        n = len(self.pool)
+        used = set()
+        for j, item in enumerate(items):
+            index = first + j
+            slot = index % n
+            used.add(slot)
+            if self.slot_index[slot] != index:
+                self.fill_row(self.pool[slot], item, index, index == self.selected)
+                self.slot_index[slot] = index
+                self.canvas.coords(self.window_ids[slot], 0, index * self.row_height)
+            self.canvas.itemconfigure(self.window_ids[slot], state="normal")
+        for slot in range(n):
+            if slot not in used:
+                self.slot_index[slot] = None
+                self.canvas.itemconfigure(self.window_ids[slot], state="hidden")
+
+    def curselection(self):
+        return () if self.selected is None else (self.selected,)
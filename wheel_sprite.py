@@ -0,0 +1,124 @@
+import math
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+SUPERSAMPLE = 2
+FONT_CANDIDATES = ["arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf"]
+
+_font_cache = {}
+
+def load_font(size):
+    if size in _font_cache:
+        return _font_cache[size]
+    font = None
+    for name in FONT_CANDIDATES:
+        try:
+            font = ImageFont.truetype(name, size)
+            break
+        except:
+            continue
+    if font is None:
+        font = ImageFont.load_default()
+    _font_cache[size] = font
+    return font
+
+def render_wheel_sprite(layout_style, labels, extents, colors, radius):
+    # Draws the wheel at angle 0, supersampled and reduced once, so per-frame work is just a rotation
+    ss = SUPERSAMPLE
+    size = int(radius * 2) + 8
+    big = size * ss
+    r = radius * ss
+    c = big / 2
+    img = Image.new("RGBA", (big, big), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    start = 0.0
+    for i, extent in enumerate(extents):
+        color = colors[i % len(colors)]
+        if layout_style == "Polygon":
+            a1, a2 = math.radians(start), math.radians(start + extent)
+            draw.polygon([
+                (c, c),
+                (c + math.cos(a1) * r, c - math.sin(a1) * r),
+                (c + math.cos(a2) * r, c - math.sin(a2) * r)
+            ], fill=color, outline="#2b2b2b", width=3 * ss)
+        else:
+            # PIL measures angles clockwise, Tk counter-clockwise
+            draw.pieslice([c - r, c - r, c + r, c + r], start=-(start + extent), end=-start, fill=color, outline="#2d3436", width=2 * ss)
+        start += extent
+
+    # Tk font sizes are points, PIL sizes are pixels
+    font = load_font(max(1, int(radius * 0.05 * 4 / 3)) * ss)
+    text_radius = r * 0.70
+    start = 0.0
+    for label, extent in zip(labels, extents):
+        mid = start + extent / 2
+        if label:
+            bbox = draw.multiline_textbbox((0, 0), label, font=font, align="center")
+            tw, th = int(bbox[2] - bbox[0]) + 4, int(bbox[3] - bbox[1]) + 4
+            text_img = Image.new("RGBA", (tw, th), (0, 0, 0, 0))
+            ImageDraw.Draw(text_img).multiline_text((tw / 2, th / 2), label, font=font, fill="#ffffff", anchor="mm", align="center")
+            text_img = text_img.rotate(-mid, resample=Image.BICUBIC, expand=True)
+            x = c + math.cos(math.radians(mid)) * text_radius
+            y = c - math.sin(math.radians(mid)) * text_radius
+            img.alpha_composite(text_img, (int(x - text_img.width / 2), int(y - text_img.height / 2)))
+        start += extent
+
+    return img.resize((size, size), Image.LANCZOS)
+
+class WheelSpriteCache:
+    def __init__(self, budget_bytes=96 * 1024 * 1024, angle_step=1.0):
+        self.budget_bytes = budget_bytes
+        self.angle_step = angle_step
+        self.sprites = OrderedDict()
+        self.frames = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_sprite(self, key, layout_style, labels, extents, colors, radius):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = render_wheel_sprite(layout_style, labels, extents, colors, radius)
+            self.sprites[key] = sprite
+            self.used_bytes += sprite.width * sprite.height * 4
+            self.evict()
+        else:
+            self.sprites.move_to_end(key)
+        return sprite
+
+    def get_frame(self, key, layout_style, labels, extents, colors, radius, angle):
+        step = self.angle_step
+        bucket = int(round((angle % 360) / step)) % int(round(360 / step))
+        frame_key = (key, bucket)
+        photo = self.frames.get(frame_key)
+        if photo is not None:
+            self.frames.move_to_end(frame_key)
+            self.hits += 1
+            return photo
+
+        self.misses += 1
+        sprite = self.get_sprite(key, layout_style, labels, extents, colors, radius)
+        rotation = bucket * step
+        # The polygon layout turns clockwise as its angle grows
+        if layout_style == "Polygon":
+            rotation = -rotation
+        rotated = sprite.rotate(rotation, resample=Image.BILINEAR) if bucket else sprite
+        photo = ImageTk.PhotoImage(rotated)
+        self.frames[frame_key] = photo
+        self.used_bytes += sprite.width * sprite.height * 4
+        self.evict()
+        return photo
+
+    def evict(self):
+        while self.used_bytes > self.budget_bytes and self.frames:
+            _, photo = self.frames.popitem(last=False)
+            self.used_bytes -= photo.width() * photo.height() * 4
+        while self.used_bytes > self.budget_bytes and len(self.sprites) > 1:
+            _, sprite = self.sprites.popitem(last=False)
+            self.used_bytes -= sprite.width * sprite.height * 4
+
+    def clear(self):
+        self.sprites.clear()
+        self.frames.clear()
+        self.used_bytes = 0